@@ -1,11 +1,17 @@
+import json
 import os
 
 from langchain_openai import ChatOpenAI
 from typing import Optional
 from datetime import datetime
 from dotenv import load_dotenv
+from loguru import logger
 
-from utils import azure_chat_model
+from agents.streaming import StreamingStructuredLLM
+from core.metrics import Metrics, get_metrics
+from services.replay import ReplayArchive, ReplayingLLM, ReplayMiss, get_archive
+from services.usage import Reservation, ScanRun
+from utils import DEFAULT_MODEL_SPEC, ModelSpec, azure_chat_model, estimate_tokens
 
 load_dotenv()
 from models.model import (
@@ -20,16 +26,49 @@ from models.model import (
 class SignalDetector:
     """Extracts business signals from text using structured LLM output"""
 
-    def __init__(self, api_key: str, model: str = "gpt-4.1"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4.1",
+        metrics: Optional[Metrics] = None,
+        spec: ModelSpec = DEFAULT_MODEL_SPEC,
+        archive: Optional[ReplayArchive] = None,
+        streaming: Optional[bool] = None,
+    ):
         # self.llm = ChatOpenAI(
         #     model=model,
         #     temperature=0.1,
         #     api_key=api_key
         # ).with_structured_output(Signal)
-        self.llm = azure_chat_model().with_structured_output(Signal)
-
-    def extract(self, company_name: str, text: str) -> Optional[Signal]:
-        """Extract signal from text about a company"""
+        self.spec = spec
+        self.metrics = metrics or get_metrics()
+        archive = archive if archive is not None else get_archive()
+        if streaming is None:
+            streaming = os.getenv("STREAM_EXTRACTION") == "true"
+
+        # Replaying never touches the network, so don't build a client
+        llm = None
+        if archive is None or not archive.replaying:
+            chat_model = azure_chat_model(spec)
+            if streaming:
+                # Hangs up as soon as the reply is known to be filtered out
+                llm = StreamingStructuredLLM(chat_model, Signal, self._discardable)
+            else:
+                # include_raw keeps the AIMessage around so we can read token usage
+                llm = chat_model.with_structured_output(Signal, include_raw=True)
+        if archive is not None:
+            llm = ReplayingLLM(llm, archive, Signal, spec.deployment_name)
+        self.llm = llm
+
+    def extract(
+        self, company_name: str, text: str, run: Optional[ScanRun] = None
+    ) -> Optional[Signal]:
+        """Extract signal from text about a company.
+
+        When a run is given, usage is charged to it and BudgetExceeded is
+        raised instead of making a call that would go over its budget.
+        Replaying a prompt the archive doesn't have raises ReplayMiss.
+        """
 
         prompt = f"""
         Analyze this text about {company_name} and extract business signals.
@@ -50,18 +89,111 @@ class SignalDetector:
         Make the title specific and the action concrete with a clear timeline.
         """
 
+        reservation = None
+        if run is not None:
+            reservation = run.reserve(self.spec, estimate_tokens(prompt))
+
         try:
-            signal = self.llm.invoke(prompt)
+            with self.metrics.timer(
+                "stage_seconds", component="signal_detector", stage="llm"
+            ):
+                result = self.llm.invoke(prompt)
+
+            self._record_usage(company_name, prompt, result["raw"], run, reservation)
+
+            if result.get("stopped") is not None:
+                self.metrics.inc("extractions_total", outcome="stopped_early")
+                return None
+
+            signal = result["parsed"]
+            if signal is None:
+                raise ValueError(result["parsing_error"])
 
             # Filter out low-confidence or no-signal results
             if signal.type == SignalType.none or signal.confidence == Confidence.low:
+                self.metrics.inc("extractions_total", outcome="filtered")
                 return None
 
+            self.metrics.inc("extractions_total", outcome="emitted")
+            self.metrics.inc("signals_extracted_total", type=signal.type.value)
+            if run is not None:
+                run.record_signal(company_name)
             return signal
 
+        except ReplayMiss:
+            # A replay must be deterministic; a gap in the archive is an error
+            logger.error(f"No recorded LLM response for {company_name} in archive")
+            raise
         except Exception as e:
-            print(f"Extraction failed: {e}")
+            logger.warning(f"Extraction failed: {e}")
+            self.metrics.inc("extractions_total", outcome="failed")
             return None
+        finally:
+            # No-op once usage was recorded; frees the budget if the call failed
+            if run is not None:
+                run.release(reservation)
+
+    @staticmethod
+    def _discardable(fields) -> bool:
+        """Whether streamed fields already show the signal would be filtered"""
+        return (
+            fields.get("type") == SignalType.none.value
+            or fields.get("confidence") == Confidence.low.value
+        )
+
+    def _record_usage(
+        self,
+        company_name: str,
+        prompt: str,
+        message,
+        run: Optional[ScanRun],
+        reservation: Optional[Reservation] = None,
+    ) -> None:
+        """Record token counts reported on the raw LLM response.
+
+        Responses without usage (some proxies and older API versions) are
+        charged an estimate, so the run budget still applies to them.
+        """
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            output_tokens = estimate_tokens(self._reply_text(message))
+            usage = {
+                "input_tokens": estimate_tokens(prompt),
+                "output_tokens": output_tokens,
+            }
+            logger.debug("LLM response had no usage metadata, charging an estimate")
+
+        input_tokens = usage["input_tokens"]
+        output_tokens = usage["output_tokens"]
+
+        self.metrics.inc("llm_tokens_total", input_tokens, direction="input")
+        self.metrics.inc("llm_tokens_total", output_tokens, direction="output")
+        self.metrics.inc(
+            "llm_cost_usd_total",
+            self.spec.cost(input_tokens, output_tokens),
+            model=self.spec.deployment_name,
+        )
+
+        if run is not None:
+            run.record(
+                company_name, self.spec, input_tokens, output_tokens, reservation
+            )
+
+        # Azure reports prompt-cache reads under input_token_details
+        cached = usage.get("input_token_details", {}).get("cache_read", 0)
+        if cached:
+            self.metrics.inc("cache_hits_total", cache="llm_prompt")
+        else:
+            self.metrics.inc("cache_misses_total", cache="llm_prompt")
+
+    @staticmethod
+    def _reply_text(message) -> str:
+        """Text the model generated, including structured-output tool calls"""
+        if message is None:
+            return ""
+        content = message.content if isinstance(message.content, str) else ""
+        calls = getattr(message, "tool_calls", None) or []
+        return content + "".join(json.dumps(call.get("args", {})) for call in calls)
 
     def extract_with_metadata(
         self,
@@ -69,10 +201,11 @@ class SignalDetector:
         text: str,
         source_url: Optional[str] = None,
         article_date: Optional[str] = None,
+        run: Optional[ScanRun] = None,
     ) -> Optional[SignalWithMetadata]:
         """Extract signal and add metadata"""
 
-        signal = self.extract(company_name, text)
+        signal = self.extract(company_name, text, run)
         if not signal:
             return None
 
@@ -83,6 +216,9 @@ class SignalDetector:
                 article_datetime = datetime.fromisoformat(article_date)
             except:
                 pass
+        # Timestamps are naive local time elsewhere (see detected_at)
+        if article_datetime and article_datetime.tzinfo is not None:
+            article_datetime = article_datetime.astimezone().replace(tzinfo=None)
 
         return SignalWithMetadata(
             **signal.dict(),
@@ -0,0 +1,123 @@
+import json
+import re
+from typing import Callable, Dict, Optional, Type
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel, ValidationError
+
+from utils import estimate_tokens
+
+# One top-level "key": value pair, anchored where the previous one ended.
+# Strings are complete once their closing quote arrives; bare scalars need the
+# following separator, since "12" may still become "123".
+FIELD_PATTERN = re.compile(
+    r'\s*,?\s*"(\w+)"\s*:\s*'
+    r'("(?:[^"\\]|\\.)*"|(?:true|false|null|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?=\s*[,}]))'
+)
+END_PATTERN = re.compile(r"\s*}")
+
+
+class JsonFieldScanner:
+    """Picks completed fields out of a flat JSON object as it streams in.
+
+    Only the unread tail of the buffer is scanned on each feed, so the whole
+    reply is parsed in one pass. Nested values stop the scan; the full text
+    is still available for validation at the end.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, object] = {}
+        self.complete = False
+        self._pos: Optional[int] = None
+
+    def feed(self, text: str) -> Dict[str, object]:
+        """Add streamed text and return the fields it completed"""
+        self.buffer += text
+        if self._pos is None:
+            start = self.buffer.find("{")
+            if start < 0:
+                return {}
+            self._pos = start + 1
+
+        new_fields = {}
+        while match := FIELD_PATTERN.match(self.buffer, self._pos):
+            new_fields[match.group(1)] = json.loads(match.group(2))
+            self._pos = match.end()
+
+        if END_PATTERN.match(self.buffer, self._pos):
+            self.complete = True
+
+        self.fields.update(new_fields)
+        return new_fields
+
+
+class StreamingStructuredLLM:
+    """Streams a structured reply and hangs up once it is known to be unwanted.
+
+    ``invoke`` returns the same dict as ``with_structured_output(schema,
+    include_raw=True)``, plus ``stopped``: the fields seen when ``stop_when``
+    fired, or None if the reply ran to completion. Complete replies are
+    validated against the schema as usual. A cancelled stream never reports
+    usage, so its tokens are estimated from the prompt length and the number
+    of chunks received.
+    """
+
+    def __init__(
+        self,
+        chat_model,
+        schema: Type[BaseModel],
+        stop_when: Callable[[Dict[str, object]], bool],
+    ):
+        self.schema = schema
+        self.stop_when = stop_when
+        self.llm = chat_model.bind(response_format=schema, stream_usage=True)
+
+    def invoke(self, prompt: str) -> Dict:
+        scanner = JsonFieldScanner()
+        output_chunks = 0
+        usage = None
+        stopped = None
+
+        stream = self.llm.stream(prompt)
+        try:
+            for chunk in stream:
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+                # The final chunk repeats the whole completion; skip it
+                content = chunk.content
+                if scanner.complete or not content or not isinstance(content, str):
+                    continue
+
+                output_chunks += 1
+                if scanner.feed(content) and self.stop_when(scanner.fields):
+                    stopped = dict(scanner.fields)
+                    break
+        finally:
+            # Closing the generator closes the HTTP response, cancelling the call
+            stream.close()
+
+        if stopped is not None or usage is None:
+            input_tokens = estimate_tokens(prompt)
+            usage = {
+                "input_tokens": input_tokens,
+                "output_tokens": output_chunks,
+                "total_tokens": input_tokens + output_chunks,
+            }
+        raw = AIMessage(content=scanner.buffer, usage_metadata=usage)
+
+        if stopped is not None:
+            return {
+                "raw": raw,
+                "parsed": None,
+                "parsing_error": None,
+                "stopped": stopped,
+            }
+
+        try:
+            parsed = self.schema.model_validate_json(scanner.buffer)
+            error = None
+        except ValidationError as e:
+            parsed = None
+            error = e
+        return {"raw": raw, "parsed": parsed, "parsing_error": error, "stopped": None}
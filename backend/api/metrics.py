@@ -0,0 +1,56 @@
+import time
+
+from fastapi import APIRouter, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import get_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    backend = get_metrics()
+    return Response(content=backend.render(), media_type=backend.content_type)
+
+
+class RequestMetricsMiddleware:
+    """Record request count and latency per route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which costs a task and a
+    response stream per request; with metrics disabled it passes straight
+    through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        backend = get_metrics()
+        if scope["type"] != "http" or not backend.enabled:
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        # An unhandled error propagates out of the app and becomes a 500 in
+        # ServerErrorMiddleware, outside this one; count it as a 500 here
+        status = "500"
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+
+            # The router records the matched route in the shared scope; use its
+            # template rather than the raw path to bound label cardinality
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+
+            backend.observe("http_request_seconds", elapsed, method=method, route=path)
+            backend.inc("http_requests_total", method=method, route=path, status=status)
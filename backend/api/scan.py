@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from models.scan import ScanJob
+from services.auth import auth_service
+from services.scan import scan_service
+
+router = APIRouter()
+security = HTTPBearer()
+
+
+@router.post("/{company}", response_model=ScanJob)
+async def start_scan(
+    company: str,
+    response: Response,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    # Scans spend LLM budget, so only signed-in users may start them
+    await auth_service.get_current_user(credentials.credentials)
+
+    job = scan_service.submit(company)
+    if not job.done:
+        response.status_code = status.HTTP_202_ACCEPTED
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ScanJob)
+async def get_scan_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for completion"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    await auth_service.get_current_user(credentials.credentials)
+
+    job = await scan_service.wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return job
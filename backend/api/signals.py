@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from models.aggregates import AggregatesResponse, RollupBucket
+from models.model import ImpactLevel, SignalType
+from models.auth import UserResponse
+from services.aggregates import aggregate_service
+from services.auth import auth_service
+
+router = APIRouter()
+security = HTTPBearer()
+
+
+async def current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> UserResponse:
+    return await auth_service.get_current_user(credentials.credentials)
+
+
+# A plain def: the Supabase client is blocking, so FastAPI runs this in its
+# threadpool instead of on the event loop
+@router.get("/aggregates", response_model=AggregatesResponse)
+def get_aggregates(
+    days: int = Query(30, ge=1, le=365),
+    company: Optional[str] = None,
+    signal_type: Optional[SignalType] = None,
+    impact: Optional[ImpactLevel] = None,
+    bucket: RollupBucket = RollupBucket.day,
+    user: UserResponse = Depends(current_user),
+):
+    rollups = aggregate_service.get_rollups(
+        since=date.today() - timedelta(days=days - 1),
+        company_name=company,
+        signal_type=signal_type,
+        impact=impact,
+        bucket=bucket,
+    )
+    return AggregatesResponse(bucket=bucket, rollups=rollups)
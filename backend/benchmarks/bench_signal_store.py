@@ -0,0 +1,134 @@
+"""Memory and throughput of SignalStore against a list of pydantic models.
+
+Run from backend/:  python -m benchmarks.bench_signal_store [--n 1000000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from models.model import Confidence, ImpactLevel, SignalType, SignalWithMetadata
+from services.signal_store import SignalStore
+
+COMPANIES = [f"Company {i}" for i in range(500)]
+START = datetime(2025, 1, 1)
+
+
+def make_signals(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    types = list(SignalType)
+    impacts = list(ImpactLevel)
+    confidences = list(Confidence)
+
+    for i in range(n):
+        yield SignalWithMetadata(
+            type=rng.choice(types),
+            impact=rng.choice(impacts),
+            confidence=rng.choice(confidences),
+            title=f"Signal {i}",
+            action="Schedule a check-in",
+            company_name=rng.choice(COMPANIES),
+            detected_at=START + timedelta(minutes=rng.randrange(60 * 24 * 90)),
+        )
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+
+def timed(label, fn, repeat=5):
+    best = min(_time_once(fn) for _ in range(repeat))
+    print(f"  {label:<36} {best * 1000:9.1f} ms")
+
+
+def _time_once(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument(
+        "--baseline-n",
+        type=int,
+        default=100_000,
+        help="signals kept as pydantic models for the memory baseline",
+    )
+    args = parser.parse_args()
+    n = args.n
+    baseline_n = min(args.baseline_n, n)
+
+    print(f"Memory ({baseline_n:,} signals)")
+    models, _, models_bytes, _ = measure(lambda: list(make_signals(baseline_n)))
+    _, ingest_s, _, _ = measure(lambda: SignalStore.from_signals(models))
+    # Build from fresh models so the store's strings are counted too
+    _, _, store_bytes, _ = measure(
+        lambda: SignalStore.from_signals(make_signals(baseline_n))
+    )
+    print(f"  pydantic list:  {models_bytes / baseline_n:7.0f} B/signal")
+    print(f"  columnar store: {store_bytes / baseline_n:7.0f} B/signal")
+    print(f"  ingest:         {baseline_n / ingest_s:,.0f} signals/s")
+    del models
+
+    # Stream models straight into the store so the full run never holds
+    # n pydantic objects at once
+    print(f"Building store with {n:,} signals")
+    started = time.perf_counter()
+    store = SignalStore()
+    batch = []
+    for signal in make_signals(n):
+        batch.append(signal)
+        if len(batch) == 10_000:
+            store.extend(batch)
+            batch = []
+    store.extend(batch)
+    print(f"  built in {time.perf_counter() - started:.1f}s")
+    print(f"  numeric columns: {store.nbytes / 2**20:.1f} MiB")
+
+    print("Aggregations")
+    since = START + timedelta(days=60)
+    timed("count_by(type)", lambda: store.count_by("type"))
+    timed(
+        "count_by(company, type, day)", lambda: store.count_by("company", "type", "day")
+    )
+    timed(
+        "mask(high impact, last 30 days)",
+        lambda: store.mask(impact=ImpactLevel.high, since=since),
+    )
+    mask = store.mask(company=COMPANIES[:10], type=SignalType.funding)
+    timed(
+        "count_by(impact) on 10 companies", lambda: store.count_by("impact", mask=mask)
+    )
+
+    # The dict loop demo_runner used before the store, for comparison
+    models = store.to_signals(store.mask(since=START + timedelta(days=80)))
+
+    def dict_group_by():
+        by_type = {}
+        for sig in models:
+            by_type.setdefault(sig.type.value, []).append(sig)
+
+    timed(f"dict group-by over {len(models):,} models", dict_group_by)
+    timed(
+        f"count_by(type) over same {len(models):,} rows",
+        lambda: store.count_by(
+            "type", mask=store.mask(since=START + timedelta(days=80))
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Local stand-in for the Supabase auth (GoTrue) and REST (PostgREST) APIs.
+
+Serves just enough of both for the backend to run against it: password
+sign-up and sign-in, token lookup, and an in-memory table store. Users
+loadtest-0@example.com .. loadtest-{N-1}@example.com are seeded with the
+password LOAD_TEST_PASSWORD. --latency-ms adds a delay to every response to
+stand in for the network hop to a hosted project.
+
+Run from backend/:  python -m benchmarks.fake_supabase [--port 54321]
+"""
+
+import argparse
+import asyncio
+import secrets
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+LOAD_TEST_PASSWORD = "load-test-password"
+TOKEN_TTL_SECONDS = 3600
+
+
+def load_test_email(i: int) -> str:
+    return f"loadtest-{i}@example.com"
+
+
+def create_app(users: int = 100, latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Fake Supabase")
+    accounts: Dict[str, Dict] = {}
+    sessions: Dict[str, str] = {}
+    tables = defaultdict(list)
+    latency = latency_ms / 1000
+
+    def add_user(email: str, password: str, metadata: Dict) -> Dict:
+        now = datetime.now(timezone.utc).isoformat()
+        accounts[email] = {
+            "password": password,
+            "user": {
+                "id": str(uuid.uuid4()),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "app_metadata": {"provider": "email"},
+                "user_metadata": metadata,
+                "created_at": now,
+                "updated_at": now,
+            },
+        }
+        return accounts[email]["user"]
+
+    def new_session(email: str) -> Dict:
+        token = secrets.token_urlsafe(24)
+        sessions[token] = email
+        return {
+            "access_token": token,
+            "refresh_token": secrets.token_urlsafe(24),
+            "token_type": "bearer",
+            "expires_in": TOKEN_TTL_SECONDS,
+            "expires_at": int(datetime.now().timestamp()) + TOKEN_TTL_SECONDS,
+            "user": accounts[email]["user"],
+        }
+
+    def auth_error(status: int, code: str, message: str) -> JSONResponse:
+        return JSONResponse(
+            {"code": status, "error_code": code, "msg": message}, status_code=status
+        )
+
+    for i in range(users):
+        add_user(load_test_email(i), LOAD_TEST_PASSWORD, {"full_name": f"User {i}"})
+
+    @app.middleware("http")
+    async def simulate_latency(request: Request, call_next):
+        if latency:
+            await asyncio.sleep(latency)
+        return await call_next(request)
+
+    @app.get("/auth/v1/health")
+    async def health():
+        return {"name": "GoTrue", "version": "fake"}
+
+    @app.post("/auth/v1/signup")
+    async def signup(request: Request):
+        body = await request.json()
+        if body["email"] in accounts:
+            return auth_error(422, "user_already_exists", "User already registered")
+        add_user(body["email"], body["password"], body.get("data") or {})
+        return new_session(body["email"])
+
+    @app.post("/auth/v1/token")
+    async def token(request: Request):
+        body = await request.json()
+        account = accounts.get(body.get("email"))
+        if account is None or account["password"] != body.get("password"):
+            return auth_error(400, "invalid_credentials", "Invalid login credentials")
+        return new_session(body["email"])
+
+    @app.get("/auth/v1/user")
+    async def user(request: Request):
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        email = sessions.get(token)
+        if email is None:
+            return auth_error(403, "bad_jwt", "invalid JWT: unable to parse token")
+        return accounts[email]["user"]
+
+    @app.post("/auth/v1/logout")
+    async def logout():
+        return Response(status_code=204)
+
+    @app.get("/rest/v1/{table}")
+    async def select(table: str):
+        return tables[table]
+
+    @app.post("/rest/v1/{table}", status_code=201)
+    async def insert(table: str, request: Request):
+        rows = await request.json()
+        rows = rows if isinstance(rows, list) else [rows]
+        tables[table].extend(rows)
+        return rows
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.users, args.latency_ms),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
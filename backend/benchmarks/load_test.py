@@ -0,0 +1,355 @@
+"""Load test for the auth and health routes against a local fake Supabase.
+
+Starts benchmarks.fake_supabase and the app under uvicorn, pointed at each
+other through SUPABASE_URL, then drives a weighted mix of requests at a fixed
+concurrency and reports throughput and p50/p99 latency per route. With
+--thresholds it exits non-zero when any route misses its limits, so it can
+gate a deploy. --baseline does the same against a summary saved earlier with
+--output, allowing each route to be --tolerance slower than it was.
+
+Run from backend/:
+    python -m benchmarks.load_test --thresholds benchmarks/load_thresholds.json
+
+load_thresholds.json was calibrated at concurrency 8 on a single core, at
+roughly twice the worst p99 and half the lowest throughput of three runs;
+runs against it use that concurrency unless --concurrency says otherwise.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fake_supabase import LOAD_TEST_PASSWORD, load_test_email
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# mix name -> (method, path)
+ROUTES = {
+    "login": ("POST", "/api/auth/login"),
+    "me": ("GET", "/api/auth/me"),
+    "health": ("GET", "/health"),
+}
+
+DEFAULT_CONCURRENCY = 32
+
+# Error rate a baseline comparison tolerates when the baseline itself had none
+BASELINE_ERROR_RATE = 0.01
+
+# route -> [(latency seconds, ok)]
+Samples = Dict[str, List[Tuple[float, bool]]]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'login=1,me=4' into route weights"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}, expected one of {list(ROUTES)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(samples: Samples, elapsed: float) -> Dict[str, Dict]:
+    summary = {}
+    for name, results in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, ok in results if not ok)
+        summary[name] = {
+            "requests": len(results),
+            "errors": errors,
+            "error_rate": errors / len(results) if results else 0.0,
+            "rps": len(results) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+    return summary
+
+
+def check_thresholds(summary: Dict[str, Dict], thresholds: Dict) -> List[str]:
+    """Return a message per limit the run missed; empty means it passed"""
+    failures = []
+    max_error_rate = thresholds.get("max_error_rate", 0.0)
+
+    for name, limits in thresholds.get("routes", {}).items():
+        stats = summary.get(name)
+        if stats is None:
+            continue
+        if stats["error_rate"] > max_error_rate:
+            failures.append(
+                f"{name}: error rate {stats['error_rate']:.2%} > {max_error_rate:.2%}"
+            )
+        for key in ("p50_ms", "p99_ms"):
+            if key in limits and stats[key] > limits[key]:
+                failures.append(f"{name}: {key} {stats[key]:.1f} > {limits[key]}")
+        if "min_rps" in limits and stats["rps"] < limits["min_rps"]:
+            failures.append(
+                f"{name}: throughput {stats['rps']:.1f} rps < {limits['min_rps']}"
+            )
+    return failures
+
+
+def baseline_thresholds(baseline: Dict[str, Dict], tolerance: float) -> Dict:
+    """Limits allowing each route to be tolerance slower than a saved summary"""
+    slack = 1 + tolerance
+    error_rates = [stats["error_rate"] for stats in baseline.values()]
+    return {
+        "max_error_rate": max(error_rates + [BASELINE_ERROR_RATE]),
+        "routes": {
+            name: {
+                "p50_ms": round(stats["p50_ms"] * slack, 1),
+                "p99_ms": round(stats["p99_ms"] * slack, 1),
+                "min_rps": round(stats["rps"] / slack, 1),
+            }
+            for name, stats in baseline.items()
+        },
+    }
+
+
+def print_summary(summary: Dict[str, Dict], elapsed: float) -> None:
+    total = sum(stats["requests"] for stats in summary.values())
+    print(f"{total:,} requests in {elapsed:.1f}s ({total / elapsed:,.0f} rps)")
+    print(
+        f"  {'route':<8} {'requests':>9} {'errors':>7} {'rps':>8} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    for name, stats in summary.items():
+        print(
+            f"  {name:<8} {stats['requests']:>9,} {stats['errors']:>7,} "
+            f"{stats['rps']:>8.1f} {stats['p50_ms']:>8.1f} "
+            f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+        )
+
+
+async def login(client: httpx.AsyncClient, user: int) -> httpx.Response:
+    return await client.post(
+        ROUTES["login"][1],
+        json={"email": load_test_email(user), "password": LOAD_TEST_PASSWORD},
+    )
+
+
+async def drive(
+    base_url: str,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    users: int,
+    seed: int = 0,
+) -> Tuple[Samples, float]:
+    """Send the request mix from concurrency workers for duration seconds"""
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        # Tokens for /me come from real logins, made before timing starts
+        responses = await asyncio.gather(
+            *(login(client, user) for user in range(min(users, concurrency)))
+        )
+        tokens = [r.json()["access_token"] for r in responses if r.is_success]
+        if "me" in mix and not tokens:
+            raise RuntimeError("Could not log in any load test user")
+
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        samples: Samples = defaultdict(list)
+        deadline = time.perf_counter() + duration
+
+        async def worker(rng: random.Random):
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    if name == "login":
+                        response = await login(client, rng.randrange(users))
+                    elif name == "me":
+                        response = await client.get(
+                            ROUTES["me"][1],
+                            headers={"Authorization": f"Bearer {rng.choice(tokens)}"},
+                        )
+                    else:
+                        response = await client.request(*ROUTES[name])
+                    ok = response.is_success
+                except httpx.HTTPError:
+                    ok = False
+                samples[name].append((time.perf_counter() - started, ok))
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(worker(random.Random(seed + i)) for i in range(concurrency))
+        )
+        return samples, time.perf_counter() - started
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_servers(args, processes: List[subprocess.Popen]) -> None:
+    """Start the fake Supabase and the app, adding each to processes"""
+    fake_port = free_port()
+    fake = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.fake_supabase",
+            f"--port={fake_port}",
+            f"--users={args.users}",
+            f"--latency-ms={args.supabase_latency_ms}",
+        ],
+        cwd=BACKEND_DIR,
+    )
+    processes.append(fake)
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    wait_until_ready(f"{fake_url}/auth/v1/health", fake)
+
+    env = {
+        **os.environ,
+        "SUPABASE_URL": fake_url,
+        "SUPABASE_KEY": "fake-anon-key",
+        "ALLOWED_ORIGINS": '["http://localhost:3000"]',
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "unused"),
+        "REPLAY_MODE": "off",
+    }
+    app = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            f"--port={args.port}",
+            f"--workers={args.workers}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    processes.append(app)
+    wait_until_ready(f"http://127.0.0.1:{args.port}/health", app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="defaults to the one in --thresholds, if any, "
+        f"else {DEFAULT_CONCURRENCY}",
+    )
+    parser.add_argument("--duration", type=float, default=15, help="seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds")
+    parser.add_argument("--mix", default="login=1,me=4,health=2")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument(
+        "--supabase-latency-ms",
+        type=float,
+        default=0.0,
+        help="delay the fake Supabase adds to every response",
+    )
+    parser.add_argument("--thresholds", type=Path, help="JSON limits to enforce")
+    parser.add_argument("--output", type=Path, help="write the summary as JSON")
+    parser.add_argument(
+        "--baseline", type=Path, help="summary from an earlier --output to compare to"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="fraction a route may regress from the baseline",
+    )
+    args = parser.parse_args()
+    args.port = args.port or free_port()
+    mix = parse_mix(args.mix)
+
+    limits = {}
+    if args.thresholds:
+        limits["thresholds"] = json.loads(args.thresholds.read_text())
+        calibrated = limits["thresholds"].get("concurrency")
+        if args.concurrency is None:
+            args.concurrency = calibrated
+        # Latency limits only mean something at the load they were set for
+        elif calibrated is not None and calibrated != args.concurrency:
+            parser.error(
+                f"{args.thresholds} was calibrated at --concurrency {calibrated}"
+            )
+    if args.concurrency is None:
+        args.concurrency = DEFAULT_CONCURRENCY
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        limits["baseline"] = baseline_thresholds(baseline, args.tolerance)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    processes: List[subprocess.Popen] = []
+    try:
+        start_servers(args, processes)
+        if args.warmup:
+            asyncio.run(drive(base_url, mix, args.concurrency, args.warmup, args.users))
+        samples, elapsed = asyncio.run(
+            drive(base_url, mix, args.concurrency, args.duration, args.users)
+        )
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    summary = summarize(samples, elapsed)
+    print(f"Concurrency {args.concurrency}, mix {args.mix}")
+    print_summary(summary, elapsed)
+
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+
+    failures = []
+    for source, thresholds in limits.items():
+        for failure in check_thresholds(summary, thresholds):
+            failures.append(f"{source} {failure}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    if limits:
+        print("All thresholds met")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,11 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
     OPENAI_API_KEY: str
+    # How long dashboard aggregates are served from memory between writes
+    AGGREGATES_CACHE_TTL_SECONDS: int = 60
+    # Scans of the same company within this window return the earlier result
+    SCAN_FRESHNESS_SECONDS: int = 900
+    SCAN_DAYS_BACK: int = 7
 
 
 @lru_cache()
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+# Buckets cover everything from a cached lookup to a slow LLM call (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# name -> (kind, description, label names)
+METRIC_DEFINITIONS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "stage_seconds": (
+        "histogram",
+        "Latency of a pipeline stage",
+        ("component", "stage"),
+    ),
+    "articles_fetched_total": (
+        "counter",
+        "Feed entries returned by a news source",
+        ("source",),
+    ),
+    "articles_skipped_total": (
+        "counter",
+        "Feed entries dropped before extraction",
+        ("reason",),
+    ),
+    "articles_deduped_total": (
+        "counter",
+        "Articles removed as duplicates",
+        (),
+    ),
+    "extraction_deadline_misses_total": (
+        "counter",
+        "Extraction work dispatched after its deadline",
+        (),
+    ),
+    "extractions_total": (
+        "counter",
+        "Signal extraction attempts by outcome",
+        ("outcome",),
+    ),
+    "signals_extracted_total": (
+        "counter",
+        "Signals kept after confidence filtering",
+        ("type",),
+    ),
+    "llm_tokens_total": (
+        "counter",
+        "LLM tokens consumed",
+        ("direction",),
+    ),
+    "llm_cost_usd_total": (
+        "counter",
+        "Estimated LLM spend in USD",
+        ("model",),
+    ),
+    "cache_hits_total": (
+        "counter",
+        "Cache lookups that were served from cache",
+        ("cache",),
+    ),
+    "cache_misses_total": (
+        "counter",
+        "Cache lookups that missed",
+        ("cache",),
+    ),
+    "http_requests_total": (
+        "counter",
+        "HTTP requests handled by the API",
+        ("method", "route", "status"),
+    ),
+    "http_request_seconds": (
+        "histogram",
+        "HTTP request latency",
+        ("method", "route"),
+    ),
+}
+
+
+class _NullTimer:
+    """Context manager that does nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Observes the elapsed wall time of a block into a histogram"""
+
+    __slots__ = ("_metrics", "_name", "_labels", "_start")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict[str, str]):
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(
+            self._name, time.perf_counter() - self._start, **self._labels
+        )
+        return False
+
+
+class Metrics:
+    """No-op metrics backend, used when metrics are disabled.
+
+    Subclasses override ``inc``, ``observe`` and ``render``; every call site
+    goes through this interface so backends can be swapped with
+    ``set_metrics``.
+    """
+
+    enabled = False
+    content_type = "text/plain; charset=utf-8"
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+    def timer(self, name: str, **labels: str):
+        return _NULL_TIMER
+
+    def render(self) -> bytes:
+        return b""
+
+
+class PrometheusMetrics(Metrics):
+    """Metrics backend that records into a prometheus_client registry"""
+
+    enabled = True
+
+    def __init__(self, namespace: str = "insights", registry=None):
+        from prometheus_client import (
+            CONTENT_TYPE_LATEST,
+            CollectorRegistry,
+            Counter,
+            Histogram,
+        )
+
+        self.registry = registry or CollectorRegistry()
+        self.content_type = CONTENT_TYPE_LATEST
+        self._collectors = {}
+
+        for name, (kind, description, labelnames) in METRIC_DEFINITIONS.items():
+            if kind == "counter":
+                # prometheus_client appends the _total suffix itself
+                collector = Counter(
+                    name.removesuffix("_total"),
+                    description,
+                    labelnames,
+                    namespace=namespace,
+                    registry=self.registry,
+                )
+            else:
+                collector = Histogram(
+                    name,
+                    description,
+                    labelnames,
+                    namespace=namespace,
+                    registry=self.registry,
+                    buckets=LATENCY_BUCKETS,
+                )
+            self._collectors[name] = collector
+
+    def _child(self, name: str, labels: Dict[str, str]):
+        collector = self._collectors[name]
+        return collector.labels(**labels) if labels else collector
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        self._child(name, labels).inc(value)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        self._child(name, labels).observe(value)
+
+    def timer(self, name: str, **labels: str):
+        return _Timer(self, name, labels)
+
+    def render(self) -> bytes:
+        from prometheus_client import generate_latest
+
+        return generate_latest(self.registry)
+
+
+_metrics: Optional[Metrics] = None
+_lock = threading.Lock()
+
+
+def _metrics_enabled() -> bool:
+    return os.getenv("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def _create_metrics() -> Metrics:
+    if not _metrics_enabled():
+        return Metrics()
+
+    try:
+        return PrometheusMetrics()
+    except ImportError:
+        logger.warning("prometheus_client is not installed, metrics are disabled")
+        return Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics backend, creating it on first use"""
+    global _metrics
+
+    if _metrics is None:
+        with _lock:
+            if _metrics is None:
+                _metrics = _create_metrics()
+    return _metrics
+
+
+def set_metrics(metrics: Metrics) -> None:
+    """Replace the process-wide metrics backend"""
+    global _metrics
+
+    with _lock:
+        _metrics = metrics
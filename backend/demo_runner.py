@@ -5,32 +5,71 @@ load_dotenv()
 from agents.signal_detector import SignalDetector
 from services.news_fetcher import NewsFetcher
 from models.model import SignalType
+from services.article_enricher import ArticleEnricher
+from services.extraction_queue import ExtractionQueue
+from services.signal_store import SignalStore
+from services.usage import Budget, BudgetExceeded, ScanRun
+import json
 import os
+import threading
 
+COMPANIES = ["Salesforce", "Stripe", "Databricks", "Figma", "OpenAI"]
 
-def run_demo():
-    detector = SignalDetector(api_key=os.environ["OPENAI_API_KEY"])
+
+def run_demo(companies=COMPANIES) -> SignalStore:
+    # Not needed when replaying, which never builds an LLM client
+    detector = SignalDetector(api_key=os.getenv("OPENAI_API_KEY", ""))
     fetcher = NewsFetcher()
+    # Fetching full article bodies is slower but gives the detector more to go on
+    enricher = ArticleEnricher() if os.getenv("ENRICH_ARTICLES") == "true" else None
+
+    tiers = {"Salesforce": "strategic", "Databricks": "growth"}
 
-    companies = ["Salesforce", "Stripe", "Databricks", "Figma", "OpenAI"]
+    all_signals = SignalStore()
+    run = ScanRun(budget=Budget.from_env())
+    # Fetch everything first so the budget goes to the most urgent articles
+    queue = ExtractionQueue(tiers=tiers)
+    store_lock = threading.Lock()
 
-    all_signals = []
+    def extract(item):
+        article = item.article
+        signal = detector.extract_with_metadata(
+            item.company_name,
+            article["text"],
+            article["link"],
+            article["published"],
+            run=run,
+        )
+        if signal:
+            with store_lock:
+                all_signals.append(signal)
+            print(f"  🚨 Found: {signal.type.value} - {signal.title}")
 
-    for company in companies:
-        print(f"\nScanning {company}...")
+    try:
+        fetched = {}
+        for company in companies:
+            print(f"\nScanning {company}...")
 
-        # Fetch news
-        articles = fetcher.fetch_multiple_sources(company, days_back=7)
+            # Fetch news
+            fetched[company] = fetcher.fetch_multiple_sources(company, days_back=7)
 
-        # Extract signals
-        for article in articles:
-            signal = detector.extract_with_metadata(
-                company, article["text"], article["link"], article["published"]
+        # One batch, so the enricher's connections are shared across companies
+        if enricher:
+            enricher.enrich_articles(
+                [article for articles in fetched.values() for article in articles]
             )
+        for company, articles in fetched.items():
+            queue.extend(company, articles)
 
-            if signal:
-                all_signals.append(signal)
-                print(f"  🚨 Found: {signal.type.value} - {signal.title}")
+        # Extract signals, most urgent first
+        print(f"\nExtracting signals from {len(queue)} articles...")
+        concurrency = int(os.getenv("EXTRACTION_CONCURRENCY", "1"))
+        queue.drain(extract, concurrency=concurrency)
+    except BudgetExceeded as e:
+        print(f"\n⛔ Stopping scan: {e}")
+    finally:
+        if enricher:
+            enricher.close()
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -39,16 +78,17 @@ def run_demo():
     )
 
     # Group by type
-    by_type = {}
-    for sig in all_signals:
-        by_type.setdefault(sig.type.value, []).append(sig)
-
-    for type_name, signals in by_type.items():
-        print(f"\n{type_name.upper()} ({len(signals)}):")
-        for sig in signals:
+    for signal_type, count in all_signals.count_by("type").items():
+        print(f"\n{signal_type.value.upper()} ({count}):")
+        for sig in all_signals.to_signals(all_signals.mask(type=signal_type)):
             print(f"  - {sig.company_name}: {sig.title}")
             print(f"    Action: {sig.action}")
 
+    print(f"\n{'=' * 60}")
+    print("USAGE:")
+    print(json.dumps(run.report(), indent=2))
+    return all_signals
+
 
 if __name__ == "__main__":
     run_demo()
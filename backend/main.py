@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api import auth
+from api import auth, metrics, scan, signals
 from core.config import settings
+from core.metrics import get_metrics
 
 app = FastAPI(title="Competitive Insights API")
 
@@ -13,7 +14,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Skipped entirely when metrics are disabled, so it costs nothing per request
+if get_metrics().enabled:
+    app.add_middleware(metrics.RequestMetricsMiddleware)
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(signals.router, prefix="/api/signals", tags=["signals"])
+app.include_router(scan.router, prefix="/api/scan", tags=["scan"])
+app.include_router(metrics.router, tags=["metrics"])
 
 
 @app.get("/")
@@ -0,0 +1,26 @@
+from datetime import date
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel
+
+from models.model import ImpactLevel, SignalType
+
+
+class RollupBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class SignalRollup(BaseModel):
+    company_name: str
+    signal_type: SignalType
+    impact: ImpactLevel
+    bucket: date
+    count: int
+
+
+class AggregatesResponse(BaseModel):
+    bucket: RollupBucket
+    rollups: List[SignalRollup]
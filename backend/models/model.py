@@ -97,6 +97,12 @@ class Signal(BaseModel):
         description="Primary signal type - choose the most relevant category"
     )
 
+    # Generated right after type, so a streamed low-confidence reply can be
+    # dropped before the rest is written
+    confidence: Confidence = Field(
+        description="How confident we are in this signal extraction"
+    )
+
     impact: ImpactLevel = Field(description="Business impact level for prioritization")
 
     # Key details - only what's essential
@@ -115,10 +121,6 @@ class Signal(BaseModel):
         default=None, description="Key person if applicable (e.g., 'John Smith, CEO')"
     )
 
-    confidence: Confidence = Field(
-        description="How confident we are in this signal extraction"
-    )
-
 
 class SignalWithMetadata(Signal):
     """Signal with additional metadata for storage/display"""
@@ -0,0 +1,33 @@
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from models.model import SignalWithMetadata
+
+
+class ScanStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class ScanJob(BaseModel):
+    job_id: str
+    company_name: str
+    status: ScanStatus = ScanStatus.queued
+    created_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    # True when the job was answered from a fresh earlier scan
+    cached: bool = False
+    # Articles the scan fetched; zero usually means the feeds were unreachable
+    articles: int = 0
+    signals: List[SignalWithMetadata] = Field(default_factory=list)
+    usage: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (ScanStatus.completed, ScanStatus.failed)
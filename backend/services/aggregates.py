@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from core.cache import TTLCache
+from core.config import settings
+from core.supabase import supabase_client
+from models.aggregates import RollupBucket, SignalRollup
+from models.model import ImpactLevel, SignalType
+
+ROLLUP_TABLE = "signal_rollups_daily"
+PAGE_SIZE = 1000
+# The table's primary key; offset paging needs a total order, and many rows
+# share a bucket
+ROLLUP_ORDER = (
+    ("bucket", True),
+    ("company_name", False),
+    ("signal_type", False),
+    ("impact", False),
+)
+
+
+def _bucket_start(day: date, bucket: RollupBucket) -> date:
+    if bucket == RollupBucket.week:
+        return day - timedelta(days=day.weekday())
+    if bucket == RollupBucket.month:
+        return day.replace(day=1)
+    return day
+
+
+class AggregateService:
+    """Serves dashboard aggregates from the daily rollup table.
+
+    Results are cached in-process; writers call ``invalidate`` after
+    inserting signals, and the TTL bounds staleness from writes made
+    outside this process.
+    """
+
+    def __init__(self, client=None, cache: Optional[TTLCache] = None):
+        self.client = client or supabase_client
+        self.cache = cache or TTLCache(
+            "aggregates", ttl_seconds=settings.AGGREGATES_CACHE_TTL_SECONDS
+        )
+
+    def get_rollups(
+        self,
+        since: date,
+        until: Optional[date] = None,
+        company_name: Optional[str] = None,
+        signal_type: Optional[SignalType] = None,
+        impact: Optional[ImpactLevel] = None,
+        bucket: RollupBucket = RollupBucket.day,
+    ) -> List[SignalRollup]:
+        """Signal counts per company, type, impact and bucket.
+
+        since is moved back to the start of its bucket, so the oldest week or
+        month is counted in full rather than from the middle.
+        """
+        since = _bucket_start(since, bucket)
+        key = (since, until, company_name, signal_type, impact, bucket)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation
+        rows = self._fetch_daily(since, until, company_name, signal_type, impact)
+        rollups = self._rebucket(rows, bucket)
+        self.cache.set(key, rollups, generation=generation)
+        return rollups
+
+    def invalidate(self) -> None:
+        self.cache.invalidate()
+
+    def _fetch_daily(
+        self,
+        since: date,
+        until: Optional[date],
+        company_name: Optional[str],
+        signal_type: Optional[SignalType],
+        impact: Optional[ImpactLevel],
+    ) -> List[Dict]:
+        rows = []
+        offset = 0
+
+        # PostgREST caps responses, so page through the range
+        while True:
+            query = (
+                self.client.table(ROLLUP_TABLE)
+                .select("company_name,signal_type,impact,bucket,signal_count")
+                .gte("bucket", since.isoformat())
+            )
+            if until is not None:
+                query = query.lte("bucket", until.isoformat())
+            if company_name is not None:
+                query = query.eq("company_name", company_name)
+            if signal_type is not None:
+                query = query.eq("signal_type", signal_type.value)
+            if impact is not None:
+                query = query.eq("impact", impact.value)
+
+            for column, desc in ROLLUP_ORDER:
+                query = query.order(column, desc=desc)
+            page = query.range(offset, offset + PAGE_SIZE - 1).execute().data
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    def _rebucket(self, rows: List[Dict], bucket: RollupBucket) -> List[SignalRollup]:
+        counts: Dict[Tuple, int] = {}
+        for row in rows:
+            key = (
+                row["company_name"],
+                row["signal_type"],
+                row["impact"],
+                _bucket_start(date.fromisoformat(row["bucket"]), bucket),
+            )
+            counts[key] = counts.get(key, 0) + row["signal_count"]
+
+        rollups = [
+            SignalRollup(
+                company_name=company_name,
+                signal_type=signal_type,
+                impact=impact,
+                bucket=day,
+                count=count,
+            )
+            for (company_name, signal_type, impact, day), count in counts.items()
+        ]
+        rollups.sort(key=lambda r: (r.bucket, r.company_name), reverse=True)
+        return rollups
+
+
+aggregate_service = AggregateService()
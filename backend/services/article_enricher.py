@@ -0,0 +1,333 @@
+import asyncio
+import base64
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from core.cache import TTLCache
+from core.metrics import Metrics, get_metrics
+from services.replay import ReplayArchive, archive_key, get_archive
+from utils import CHARS_PER_TOKEN
+
+MAX_HTML_BYTES = 2_000_000
+BOILERPLATE_TAGS = ["script", "style", "noscript", "header", "footer", "nav", "aside"]
+
+GOOGLE_NEWS_HOST = "news.google.com"
+# Domains an interstitial links to that are never the publisher
+GOOGLE_DOMAINS = ("google.com", "gstatic.com", "googleusercontent.com")
+EMBEDDED_URL_PATTERN = re.compile(rb"https?://[\x21-\x7e]+")
+
+
+def publisher_url(link: str) -> Optional[str]:
+    """Return the publisher's URL for a feed link, or None if it can't be found.
+
+    Google News RSS links are wrappers that serve an interstitial page rather
+    than redirecting. Older article ids are base64 protobufs that embed the
+    publisher URL; newer ones are opaque, and ``interstitial_target`` has to
+    read it from the page instead.
+    """
+    parts = urlsplit(link)
+    if parts.netloc != GOOGLE_NEWS_HOST:
+        return link
+
+    article_id = parts.path.rsplit("/", 1)[-1]
+    try:
+        decoded = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except ValueError:
+        return None
+
+    match = EMBEDDED_URL_PATTERN.search(decoded)
+    if match is None:
+        return None
+
+    # The URL is a length-prefixed protobuf string; trust the prefix when it
+    # fits, since the next field's tag byte can look like a URL character
+    url = match.group()
+    start = match.start()
+    if start >= 1 and decoded[start - 1] < 0x80:
+        url = url[: decoded[start - 1]]
+    elif start >= 2 and decoded[start - 2] >= 0x80:
+        url = url[: (decoded[start - 2] & 0x7F) | (decoded[start - 1] << 7)]
+    return url.decode("ascii")
+
+
+def _is_google(url: str) -> bool:
+    host = urlsplit(url).netloc
+    return any(host == d or host.endswith(f".{d}") for d in GOOGLE_DOMAINS)
+
+
+def interstitial_target(html: str) -> Optional[str]:
+    """Return the publisher URL a Google News interstitial page leads to.
+
+    Checks the attribute the page's own redirect script reads, then a meta
+    refresh, the canonical link and finally the first outbound anchor.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    candidates = [tag["data-n-au"] for tag in soup.find_all(attrs={"data-n-au": True})]
+
+    refresh = soup.find("meta", attrs={"http-equiv": re.compile("^refresh$", re.I)})
+    if refresh is not None:
+        match = re.search(r"url=(.+)", refresh.get("content", ""), re.I)
+        if match:
+            candidates.append(match.group(1).strip("'\" "))
+    for tag in soup.find_all("link", rel="canonical", href=True):
+        candidates.append(tag["href"])
+    for tag in soup.find_all("a", href=True):
+        candidates.append(tag["href"])
+
+    for url in candidates:
+        if url.startswith(("http://", "https://")) and not _is_google(url):
+            return url
+    return None
+
+
+def extract_main_text(html: str) -> str:
+    """Pull the readable body text out of an article page.
+
+    Module-level so it can be shipped to a process pool.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(BOILERPLATE_TAGS + ["form", "figure"]):
+        tag.decompose()
+
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+    paragraphs = [" ".join(p.get_text(" ").split()) for p in root.find_all("p")]
+
+    # Short paragraphs are mostly captions, bylines and share prompts. A page
+    # without real paragraphs is an interstitial or app shell, not an article
+    return "\n".join(p for p in paragraphs if len(p) >= 40)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, ending on a word boundary"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0]
+
+
+class ArticleEnricher:
+    """Optional stage that adds full article bodies to thin RSS summaries.
+
+    Bodies are fetched concurrently through a pooled httpx client, capped
+    per host, and parsed in a process pool so the event loop stays free.
+    Results (including failures, for a shorter time) are cached by URL.
+    Each ``enrich`` call opens one client, so pass all articles of a run in
+    a single batch to reuse connections across companies. Google News links
+    whose publisher can't be found are skipped and counted.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        per_host_limit: int = 4,
+        timeout_seconds: float = 10.0,
+        max_body_tokens: int = 1500,
+        cache_ttl_seconds: float = 6 * 3600,
+        failure_ttl_seconds: float = 600,
+        executor: Optional[Executor] = None,
+        metrics: Optional[Metrics] = None,
+        archive: Optional[ReplayArchive] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.per_host_limit = per_host_limit
+        self.max_body_tokens = max_body_tokens
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self.metrics = metrics or get_metrics()
+        self.archive = archive if archive is not None else get_archive()
+        self.cache = TTLCache(
+            "article_bodies",
+            ttl_seconds=cache_ttl_seconds,
+            max_entries=5000,
+            metrics=self.metrics,
+        )
+
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._timeout = httpx.Timeout(timeout_seconds)
+        self._headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        self._transport = transport
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def enrich_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Blocking wrapper around ``enrich`` for synchronous callers"""
+        return asyncio.run(self.enrich(articles))
+
+    async def enrich(self, articles: List[Dict]) -> List[Dict]:
+        """Add a ``body`` to each article and fold it into ``text`` in place"""
+        started = time.perf_counter()
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async with httpx.AsyncClient(
+            limits=self._limits,
+            timeout=self._timeout,
+            headers=self._headers,
+            follow_redirects=True,
+            transport=self._transport,
+        ) as client:
+            bodies = await asyncio.gather(
+                *(
+                    self._body(client, host_limits, article["link"])
+                    for article in articles
+                )
+            )
+
+        unresolved = sum(1 for body in bodies if body is None)
+        if unresolved:
+            logger.warning(
+                f"Skipped {unresolved}/{len(articles)} articles whose Google News "
+                "link could not be resolved to a publisher URL"
+            )
+
+        for article, body in zip(articles, bodies):
+            if body:
+                article["body"] = body
+                article["text"] = f"{article['text']}\n\n{body}"
+
+        self.metrics.observe(
+            "stage_seconds",
+            time.perf_counter() - started,
+            component="article_enricher",
+            stage="enrich",
+        )
+        logger.info(f"Enriched {sum(1 for b in bodies if b)}/{len(articles)} articles")
+        return articles
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _body(
+        self,
+        client: httpx.AsyncClient,
+        host_limits: Dict[str, asyncio.Semaphore],
+        url: str,
+    ) -> Optional[str]:
+        """Body text for a feed link; None when it is an unresolvable wrapper"""
+        if not url:
+            return ""
+        link = url
+        url = publisher_url(link)
+        if url is None:
+            url = await self._resolve_interstitial(client, host_limits, link)
+        if url is None:
+            self.metrics.inc("articles_skipped_total", reason="opaque_link")
+            return None
+
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation
+        html = await self._fetch_html(client, host_limits, url)
+        if html is None:
+            self.cache.set(
+                url, "", generation=generation, ttl_seconds=self.failure_ttl_seconds
+            )
+            return ""
+
+        loop = asyncio.get_running_loop()
+        with self.metrics.timer(
+            "stage_seconds", component="article_enricher", stage="extract"
+        ):
+            text = await loop.run_in_executor(
+                self._get_executor(), extract_main_text, html
+            )
+
+        body = truncate_to_tokens(text, self.max_body_tokens)
+        self.cache.set(url, body, generation=generation)
+        return body
+
+    async def _resolve_interstitial(
+        self,
+        client: httpx.AsyncClient,
+        host_limits: Dict[str, asyncio.Semaphore],
+        link: str,
+    ) -> Optional[str]:
+        """Find the publisher URL behind an opaque Google News link"""
+        key = ("publisher", link)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached or None
+
+        generation = self.cache.generation
+        html = await self._fetch_html(client, host_limits, link)
+        target = None
+        if html is not None:
+            loop = asyncio.get_running_loop()
+            target = await loop.run_in_executor(
+                self._get_executor(), interstitial_target, html
+            )
+
+        if target is None:
+            self.cache.set(
+                key, "", generation=generation, ttl_seconds=self.failure_ttl_seconds
+            )
+        else:
+            self.cache.set(key, target, generation=generation)
+        return target
+
+    async def _fetch_html(
+        self,
+        client: httpx.AsyncClient,
+        host_limits: Dict[str, asyncio.Semaphore],
+        url: str,
+    ) -> Optional[str]:
+        key = archive_key("article", url)
+        if self.archive is not None and self.archive.replaying:
+            if key not in self.archive:
+                return None
+            return self.archive.get(key).decode("utf-8", errors="replace")
+
+        host = urlsplit(url).netloc
+        limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+
+        try:
+            async with limit:
+                with self.metrics.timer(
+                    "stage_seconds", component="article_enricher", stage="fetch"
+                ):
+                    content, encoding = await self._download(client, url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not fetch article body from {url}: {e}")
+            return None
+
+        if content is None:
+            return None
+        if self.archive is not None and self.archive.recording:
+            self.archive.put(key, content)
+        return content.decode(encoding or "utf-8", errors="replace")
+
+    async def _download(self, client: httpx.AsyncClient, url: str):
+        """Stream an HTML page, stopping once MAX_HTML_BYTES have arrived"""
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            if "html" not in response.headers.get("content-type", "text/html"):
+                return None, None
+
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_HTML_BYTES:
+                    break
+
+            return b"".join(chunks)[:MAX_HTML_BYTES], response.encoding
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor()
+        return self._executor
@@ -0,0 +1,245 @@
+import heapq
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.metrics import Metrics, get_metrics
+from models.model import SignalType
+
+# Cheap pre-LLM hints; weights favour the signal types that need action first
+KEYWORD_HINTS: Dict[SignalType, Tuple[re.Pattern, float]] = {
+    SignalType.leadership: (
+        re.compile(
+            r"\b(ceo|cfo|cto|coo|chief \w+ officer|steps? down|resign\w*|"
+            r"departs?|appoint\w*|names? new)\b",
+            re.I,
+        ),
+        3.0,
+    ),
+    SignalType.acquisition: (
+        re.compile(r"\b(acquir\w*|acquisition|merger|merges?|buyout|takeover)\b", re.I),
+        3.0,
+    ),
+    SignalType.layoffs: (
+        re.compile(
+            r"\b(layoffs?|lays? off|job cuts|cuts? [\d,]+ jobs|restructur\w*|"
+            r"workforce reduction)\b",
+            re.I,
+        ),
+        3.0,
+    ),
+    SignalType.funding: (
+        re.compile(r"\b(raises?|raised|funding|series [a-f]|valuation)\b", re.I),
+        2.0,
+    ),
+    SignalType.expansion: (
+        re.compile(r"\b(expan\w*|launch\w*|opens? new|enters?)\b", re.I),
+        1.0,
+    ),
+    SignalType.partnership: (
+        re.compile(r"\b(partner\w*|alliance|collaborat\w*)\b", re.I),
+        0.5,
+    ),
+}
+
+# Multipliers for how much an account matters to us
+TIER_WEIGHTS = {"strategic": 1.5, "growth": 1.2, "standard": 1.0, "long_tail": 0.7}
+
+# A story's recency weight halves every RECENCY_HALF_LIFE_HOURS
+RECENCY_HALF_LIFE_HOURS = 24.0
+
+# Hint weight from which an item gets the short, urgent deadline
+URGENT_HINT_WEIGHT = 3.0
+
+
+def keyword_hint(text: str) -> Tuple[Optional[SignalType], float]:
+    """Return the highest-weighted signal type the text hints at"""
+    best: Tuple[Optional[SignalType], float] = (None, 0.0)
+    for signal_type, (pattern, weight) in KEYWORD_HINTS.items():
+        if weight > best[1] and pattern.search(text):
+            best = (signal_type, weight)
+    return best
+
+
+def score_article(
+    article: Dict, tier: str = "standard", now: Optional[datetime] = None
+) -> Tuple[float, float]:
+    """Score an article before extraction, returning (score, hint weight)"""
+    now = now or datetime.now()
+
+    recency = 1.0
+    pub_date = article.get("pub_date")
+    if pub_date is not None:
+        age_hours = max((now - pub_date).total_seconds() / 3600, 0.0)
+        recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+
+    _, hint_weight = keyword_hint(article.get("text", ""))
+    score = (1.0 + hint_weight) * recency * TIER_WEIGHTS.get(tier, 1.0)
+    return score, hint_weight
+
+
+@dataclass
+class ExtractionItem:
+    company_name: str
+    article: Dict
+    score: float
+    enqueued_at: float
+    deadline: float
+    seq: int = field(default=0)
+
+
+class ExtractionQueue:
+    """Orders LLM extraction work so the most urgent articles go first.
+
+    Items are dispatched by score plus an aging bonus that grows with time
+    spent waiting, so low-priority work is never starved. Since every item
+    ages at the same rate, the aged order equals ordering by
+    ``score - aging * enqueued_at`` and a plain heap suffices. Any item within
+    ``urgency_window_seconds`` of its deadline (or past it) jumps the queue,
+    earliest deadline first.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[Dict[str, str]] = None,
+        aging_per_second: float = 0.01,
+        deadline_seconds: float = 3600,
+        urgent_deadline_seconds: float = 300,
+        urgency_window_seconds: float = 30,
+        drop_expired: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.tiers = tiers or {}
+        self.aging_per_second = aging_per_second
+        self.deadline_seconds = deadline_seconds
+        self.urgent_deadline_seconds = urgent_deadline_seconds
+        self.urgency_window_seconds = urgency_window_seconds
+        self.drop_expired = drop_expired
+        self.clock = clock
+        self.metrics = metrics or get_metrics()
+
+        self._by_priority: List[Tuple[float, int, ExtractionItem]] = []
+        self._by_deadline: List[Tuple[float, int, ExtractionItem]] = []
+        self._taken = set()
+        self._seq = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, company_name: str, article: Dict) -> ExtractionItem:
+        score, hint_weight = score_article(
+            article, self.tiers.get(company_name, "standard")
+        )
+        now = self.clock()
+        deadline = now + (
+            self.urgent_deadline_seconds
+            if hint_weight >= URGENT_HINT_WEIGHT
+            else self.deadline_seconds
+        )
+
+        with self._lock:
+            self._seq += 1
+            self._size += 1
+            item = ExtractionItem(
+                company_name, article, score, now, deadline, self._seq
+            )
+            priority = -(score - self.aging_per_second * now)
+            heapq.heappush(self._by_priority, (priority, item.seq, item))
+            heapq.heappush(self._by_deadline, (deadline, item.seq, item))
+        return item
+
+    def extend(self, company_name: str, articles: List[Dict]) -> None:
+        for article in articles:
+            self.push(company_name, article)
+
+    def pop(self) -> Optional[ExtractionItem]:
+        """Take the next item to extract, or None when the queue is empty"""
+        with self._lock:
+            now = self.clock()
+            item = self._pop_urgent(now) or self._pop_heap(self._by_priority)
+
+        if item is not None:
+            self.metrics.observe(
+                "stage_seconds",
+                now - item.enqueued_at,
+                component="extraction_queue",
+                stage="wait",
+            )
+            if now > item.deadline:
+                self.metrics.inc("extraction_deadline_misses_total")
+        return item
+
+    def drain(
+        self, handle: Callable[[ExtractionItem], Any], concurrency: int = 1
+    ) -> List[Tuple[ExtractionItem, Any]]:
+        """Run handle over every item in priority order with N workers.
+
+        The first exception stops all workers and is re-raised; results of
+        items handled so far are discarded with it.
+        """
+        results = []
+        stop = threading.Event()
+
+        def worker():
+            while not stop.is_set():
+                item = self.pop()
+                if item is None:
+                    return
+                try:
+                    results.append((item, handle(item)))
+                except BaseException:
+                    stop.set()
+                    raise
+
+        if concurrency <= 1:
+            worker()
+            return results
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(worker) for _ in range(concurrency)]
+            for future in futures:
+                future.result()
+        return results
+
+    def _pop_urgent(self, now: float) -> Optional[ExtractionItem]:
+        while self._by_deadline:
+            deadline, seq, item = self._by_deadline[0]
+            if seq in self._taken:
+                heapq.heappop(self._by_deadline)
+                self._taken.discard(seq)
+                continue
+
+            if deadline - now > self.urgency_window_seconds:
+                return None
+
+            if self.drop_expired and deadline < now:
+                self._take(self._by_deadline)
+                self.metrics.inc("articles_skipped_total", reason="deadline")
+                continue
+
+            return self._take(self._by_deadline)
+        return None
+
+    def _pop_heap(self, heap) -> Optional[ExtractionItem]:
+        while heap:
+            _, seq, item = heap[0]
+            if seq in self._taken:
+                heapq.heappop(heap)
+                self._taken.discard(seq)
+                continue
+            return self._take(heap)
+        return None
+
+    def _take(self, heap) -> ExtractionItem:
+        # Remove from this heap now and mark it so the other heap skips it
+        _, seq, item = heapq.heappop(heap)
+        self._taken.add(seq)
+        self._size -= 1
+        return item
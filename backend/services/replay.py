@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+from loguru import logger
+
+RECORDS_FILE = "records.bin"
+INDEX_FILE = "index.jsonl"
+
+
+class ReplayMode(str, Enum):
+    off = "off"
+    record = "record"
+    replay = "replay"
+
+
+class ReplayMiss(KeyError):
+    """Raised in replay mode when the archive has no entry for a request"""
+
+
+def archive_key(kind: str, *parts: str) -> str:
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    return f"{kind}:{digest}"
+
+
+class ReplayArchive:
+    """Append-only archive of recorded network responses.
+
+    Each payload is zlib-compressed and appended to ``records.bin``; a line
+    per record in ``index.jsonl`` maps its key to the byte range. Recording
+    the same key again appends a new record and the newest index line wins.
+    An archive has a single writer; share one instance via ``get_archive``.
+    Index lines also carry the recording time, so replayed runs can use the
+    clock of the original run for date cutoffs.
+    """
+
+    def __init__(self, path: str, mode: ReplayMode = ReplayMode.replay):
+        self.path = Path(path)
+        self.mode = ReplayMode(mode)
+        self._index: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._records_path = self.path / RECORDS_FILE
+        self._index_path = self.path / INDEX_FILE
+        self._records_path.touch()
+        self._load_index()
+
+        flags = os.O_RDWR | os.O_APPEND if self.recording else os.O_RDONLY
+        self._fd = os.open(self._records_path, flags)
+        self._index_file = open(self._index_path, "a") if self.recording else None
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == ReplayMode.record
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == ReplayMode.replay
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> bytes:
+        entry = self._index.get(key)
+        if entry is None:
+            raise ReplayMiss(key)
+
+        offset, length, _ = entry
+        # pread doesn't move the shared file offset, so no lock is needed
+        return zlib.decompress(os.pread(self._fd, length, offset))
+
+    def recorded_at(self, key: str) -> datetime:
+        entry = self._index.get(key)
+        if entry is None:
+            raise ReplayMiss(key)
+        return datetime.fromisoformat(entry[2])
+
+    def put(self, key: str, payload: bytes) -> None:
+        if not self.recording:
+            raise RuntimeError("Archive is not open for recording")
+
+        compressed = zlib.compress(payload)
+        recorded_at = datetime.now().isoformat()
+        with self._lock:
+            offset = os.lseek(self._fd, 0, os.SEEK_END)
+            os.write(self._fd, compressed)
+            self._index[key] = (offset, len(compressed), recorded_at)
+            # Index after data: a crash never leaves an entry without a record
+            entry = {
+                "key": key,
+                "offset": offset,
+                "length": len(compressed),
+                "recorded_at": recorded_at,
+            }
+            self._index_file.write(json.dumps(entry) + "\n")
+            self._index_file.flush()
+
+    def get_json(self, key: str):
+        return json.loads(self.get(key))
+
+    def put_json(self, key: str, value) -> None:
+        self.put(key, json.dumps(value).encode("utf-8"))
+
+    def close(self) -> None:
+        os.close(self._fd)
+        if self._index_file is not None:
+            self._index_file.close()
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists():
+            return
+
+        size = self._records_path.stat().st_size
+        with open(self._index_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted recording
+                    continue
+                if entry["offset"] + entry["length"] <= size:
+                    self._index[entry["key"]] = (
+                        entry["offset"],
+                        entry["length"],
+                        entry["recorded_at"],
+                    )
+
+
+class ReplayingLLM:
+    """Records or replays a structured-output runnable built with include_raw.
+
+    Requests are keyed by namespace (the model deployment) and prompt. In
+    replay mode the wrapped runnable is never called and may be None.
+    Streamed replies that were cut short replay as stopped.
+    """
+
+    def __init__(self, llm, archive: ReplayArchive, schema, namespace: str):
+        self.llm = llm
+        self.archive = archive
+        self.schema = schema
+        self.namespace = namespace
+
+    def invoke(self, prompt: str):
+        key = archive_key("llm", self.namespace, prompt)
+        if self.archive.replaying:
+            return self._decode(self.archive.get_json(key))
+
+        result = self.llm.invoke(prompt)
+        if self.archive.recording:
+            self.archive.put_json(key, self._encode(result))
+        return result
+
+    def _encode(self, result) -> Dict:
+        parsed = result["parsed"]
+        error = result["parsing_error"]
+        return {
+            "raw": result["raw"].model_dump(mode="json"),
+            "parsed": parsed.model_dump(mode="json") if parsed is not None else None,
+            "parsing_error": str(error) if error is not None else None,
+            "stopped": result.get("stopped"),
+        }
+
+    def _decode(self, data: Dict):
+        parsed = data["parsed"]
+        return {
+            "raw": AIMessage(**data["raw"]),
+            "parsed": (
+                self.schema.model_validate(parsed) if parsed is not None else None
+            ),
+            "parsing_error": data["parsing_error"],
+            "stopped": data.get("stopped"),
+        }
+
+
+_archive: Optional[ReplayArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[ReplayArchive]:
+    """Return the process-wide archive configured by REPLAY_MODE / REPLAY_DIR"""
+    global _archive
+
+    mode = ReplayMode(os.getenv("REPLAY_MODE", "off").lower())
+    if mode == ReplayMode.off:
+        return None
+
+    with _archive_lock:
+        if _archive is None:
+            path = os.getenv("REPLAY_DIR", ".replay")
+            logger.info(f"Replay archive at {path} in {mode.value} mode")
+            _archive = ReplayArchive(path, mode)
+    return _archive
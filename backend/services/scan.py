@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from agents.signal_detector import SignalDetector
+from core.cache import TTLCache
+from core.config import settings
+from models.model import SignalWithMetadata
+from models.scan import ScanJob, ScanStatus
+from services.extraction_queue import ExtractionQueue
+from services.news_fetcher import NewsFetcher
+from services.signals import SignalRepository, signal_repository
+from services.usage import Budget, BudgetExceeded, ScanRun
+
+# Runs a blocking scan for one company, returning its signals, usage report
+# and how many articles it fetched
+Scanner = Callable[[str], Tuple[List[SignalWithMetadata], Dict, int]]
+
+
+class ScanService:
+    """Runs on-demand company scans as background jobs.
+
+    Concurrent requests for the same company share one in-flight job
+    (singleflight), and a finished scan is served from cache for
+    SCAN_FRESHNESS_SECONDS. State lives in this process and is only touched
+    from the event loop, so it needs no locking; with several workers each
+    one coalesces its own requests.
+    """
+
+    def __init__(
+        self,
+        scanner: Optional[Scanner] = None,
+        repository: Optional[SignalRepository] = None,
+        freshness_seconds: Optional[float] = None,
+    ):
+        self.scanner = scanner or self._scan
+        self.repository = repository or signal_repository
+        freshness = (
+            settings.SCAN_FRESHNESS_SECONDS
+            if freshness_seconds is None
+            else freshness_seconds
+        )
+
+        self._results = TTLCache("scan_results", ttl_seconds=freshness)
+        self._jobs = TTLCache("scan_jobs", ttl_seconds=max(freshness, 3600))
+        self._inflight: Dict[str, ScanJob] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._tasks = set()
+
+        # Built on first scan; the detector needs Azure credentials
+        self._fetcher = None
+        self._detector = None
+        self._pipeline_lock = threading.Lock()
+
+    def submit(self, company_name: str) -> ScanJob:
+        """Start a scan, or join the in-flight or fresh one for this company"""
+        company_name = company_name.strip()
+        key = company_name.lower()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return inflight
+
+        fresh = self._results.get(key)
+        if fresh is not None:
+            return fresh.model_copy(update={"cached": True})
+
+        job = ScanJob(job_id=uuid.uuid4().hex, company_name=company_name)
+        self._inflight[key] = job
+        self._events[job.job_id] = asyncio.Event()
+        self._jobs.set(job.job_id, job)
+
+        task = asyncio.create_task(self._run(key, job))
+        # Keep a reference so the task isn't garbage collected mid-run
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[ScanJob]:
+        """Return the job once it finishes or the timeout passes"""
+        job = self.get(job_id)
+        event = self._events.get(job_id)
+        if job is None or event is None or timeout <= 0:
+            return job
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.get(job_id)
+
+    async def _run(self, key: str, job: ScanJob) -> None:
+        job.status = ScanStatus.running
+        try:
+            signals, usage, articles = await asyncio.to_thread(
+                self.scanner, job.company_name
+            )
+            job.signals = signals
+            job.usage = usage
+            job.articles = articles
+            job.status = ScanStatus.completed
+            # The fetcher swallows feed errors, so an empty fetch is more
+            # likely an outage than a quiet week; let the next request retry
+            if articles:
+                self._results.set(key, job)
+        except Exception as e:
+            logger.error(f"Scan for {job.company_name} failed: {e}")
+            job.error = str(e)
+            job.status = ScanStatus.failed
+        finally:
+            job.finished_at = datetime.now()
+            self._inflight.pop(key, None)
+            self._events.pop(job.job_id).set()
+
+    def _scan(self, company_name: str) -> Tuple[List[SignalWithMetadata], Dict, int]:
+        """Fetch, extract and store signals for one company"""
+        with self._pipeline_lock:
+            if self._detector is None:
+                self._fetcher = NewsFetcher()
+                self._detector = SignalDetector(api_key=settings.OPENAI_API_KEY)
+
+        articles = self._fetcher.fetch_multiple_sources(
+            company_name, days_back=settings.SCAN_DAYS_BACK
+        )
+
+        # Most promising articles first, so a tight budget is spent well
+        queue = ExtractionQueue()
+        queue.extend(company_name, articles)
+
+        run = ScanRun(budget=Budget.from_env())
+        signals = []
+        try:
+            while (item := queue.pop()) is not None:
+                signal = self._detector.extract_with_metadata(
+                    company_name,
+                    item.article["text"],
+                    item.article["link"],
+                    item.article["published"],
+                    run=run,
+                )
+                if signal:
+                    signals.append(signal)
+        except BudgetExceeded as e:
+            logger.warning(f"Scan for {company_name} stopped early: {e}")
+
+        try:
+            self.repository.insert_signals(signals)
+        except Exception as e:
+            logger.error(f"Could not store signals for {company_name}: {e}")
+
+        return signals, run.report(), len(articles)
+
+
+scan_service = ScanService()
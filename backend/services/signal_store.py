@@ -0,0 +1,332 @@
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from models.model import Confidence, ImpactLevel, SignalType, SignalWithMetadata
+
+# Enum members in a fixed order; a member's index is its code in the store
+SIGNAL_TYPES: Tuple[SignalType, ...] = tuple(SignalType)
+IMPACT_LEVELS: Tuple[ImpactLevel, ...] = tuple(ImpactLevel)
+CONFIDENCES: Tuple[Confidence, ...] = tuple(Confidence)
+
+_TYPE_CODES = {member: code for code, member in enumerate(SIGNAL_TYPES)}
+_IMPACT_CODES = {member: code for code, member in enumerate(IMPACT_LEVELS)}
+_CONFIDENCE_CODES = {member: code for code, member in enumerate(CONFIDENCES)}
+
+# Sentinel for a missing article_date
+_NO_DATE = np.iinfo(np.int64).min
+_US_PER_DAY = 86_400 * 1_000_000
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+GROUP_KEYS = ("company", "type", "impact", "confidence", "day")
+
+_NUMERIC_COLUMNS = (
+    "type_codes",
+    "impact_codes",
+    "confidence_codes",
+    "company_ids",
+    "detected_at",
+    "article_date",
+)
+_TEXT_COLUMNS = ("titles", "actions", "amounts", "people", "source_urls")
+
+
+def _to_micros(value: datetime) -> int:
+    """Microseconds since the epoch of a naive datetime"""
+    if value.tzinfo is not None:
+        # Only the instant would survive, so get() couldn't return the same value
+        raise ValueError(
+            f"SignalStore holds naive datetimes, got {value.isoformat()}; "
+            "convert it first, e.g. value.astimezone().replace(tzinfo=None)"
+        )
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+class SignalStore:
+    """Columnar in-memory store for SignalWithMetadata.
+
+    Enums are kept as uint8 codes, company names are interned into an int32
+    id column and timestamps are int64 microseconds, so filters and group-bys
+    run as numpy operations. Pydantic models are only built on the way in
+    (append/extend) and on the way out (get/to_signals). Timestamps must be
+    naive; aware ones are rejected.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self._size = 0
+
+        self.type_codes = np.empty(capacity, dtype=np.uint8)
+        self.impact_codes = np.empty(capacity, dtype=np.uint8)
+        self.confidence_codes = np.empty(capacity, dtype=np.uint8)
+        self.company_ids = np.empty(capacity, dtype=np.int32)
+        self.detected_at = np.empty(capacity, dtype=np.int64)
+        self.article_date = np.empty(capacity, dtype=np.int64)
+
+        # Free text stays in Python lists; it's only needed at the edges
+        self.titles: List[str] = []
+        self.actions: List[str] = []
+        self.amounts: List[Optional[str]] = []
+        self.people: List[Optional[str]] = []
+        self.source_urls: List[Optional[str]] = []
+
+        self.companies: List[str] = []
+        self._company_ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_signals(cls, signals: Iterable[SignalWithMetadata]) -> "SignalStore":
+        signals = list(signals)
+        store = cls(capacity=len(signals))
+        store.extend(signals)
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns"""
+        return sum(
+            getattr(self, name)[: self._size].nbytes for name in _NUMERIC_COLUMNS
+        )
+
+    def company_id(self, company_name: str) -> int:
+        """Intern a company name, returning its id"""
+        company_id = self._company_ids.get(company_name)
+        if company_id is None:
+            company_id = len(self.companies)
+            self.companies.append(company_name)
+            self._company_ids[company_name] = company_id
+        return company_id
+
+    def append(self, signal: SignalWithMetadata) -> None:
+        self.extend((signal,))
+
+    def extend(self, signals: Sequence[SignalWithMetadata]) -> None:
+        if not isinstance(signals, Sequence):
+            signals = list(signals)
+
+        # Convert timestamps up front so a rejected one leaves the store as it was
+        timestamps = [
+            (
+                _to_micros(signal.detected_at),
+                _to_micros(signal.article_date) if signal.article_date else _NO_DATE,
+            )
+            for signal in signals
+        ]
+
+        start = self._size
+        self._reserve(start + len(signals))
+
+        for offset, (signal, (detected_at, article_date)) in enumerate(
+            zip(signals, timestamps)
+        ):
+            i = start + offset
+            self.type_codes[i] = _TYPE_CODES[signal.type]
+            self.impact_codes[i] = _IMPACT_CODES[signal.impact]
+            self.confidence_codes[i] = _CONFIDENCE_CODES[signal.confidence]
+            self.company_ids[i] = self.company_id(signal.company_name)
+            self.detected_at[i] = detected_at
+            self.article_date[i] = article_date
+
+            self.titles.append(signal.title)
+            self.actions.append(signal.action)
+            self.amounts.append(signal.amount)
+            self.people.append(signal.person)
+            self.source_urls.append(signal.source_url)
+
+        self._size = start + len(signals)
+
+    def get(self, i: int) -> SignalWithMetadata:
+        """Rebuild the pydantic model for row i"""
+        article_date = int(self.article_date[i])
+
+        return SignalWithMetadata(
+            type=SIGNAL_TYPES[self.type_codes[i]],
+            impact=IMPACT_LEVELS[self.impact_codes[i]],
+            confidence=CONFIDENCES[self.confidence_codes[i]],
+            title=self.titles[i],
+            action=self.actions[i],
+            amount=self.amounts[i],
+            person=self.people[i],
+            company_name=self.companies[self.company_ids[i]],
+            source_url=self.source_urls[i],
+            detected_at=_from_micros(self.detected_at[i]),
+            article_date=(
+                _from_micros(article_date) if article_date != _NO_DATE else None
+            ),
+        )
+
+    def to_signals(self, mask: Optional[np.ndarray] = None) -> List[SignalWithMetadata]:
+        """Convert rows (optionally only those selected by mask) back to models"""
+        rows = range(self._size) if mask is None else np.flatnonzero(mask)
+        return [self.get(int(i)) for i in rows]
+
+    def mask(
+        self,
+        company: Optional[Union[str, Sequence[str]]] = None,
+        type: Optional[Union[SignalType, Sequence[SignalType]]] = None,
+        impact: Optional[Union[ImpactLevel, Sequence[ImpactLevel]]] = None,
+        confidence: Optional[Union[Confidence, Sequence[Confidence]]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Boolean row mask; each argument accepts a single value or a list"""
+        n = self._size
+        selected = np.ones(n, dtype=bool)
+
+        if company is not None:
+            names = [company] if isinstance(company, str) else company
+            ids = [self._company_ids[c] for c in names if c in self._company_ids]
+            selected &= np.isin(self.company_ids[:n], ids)
+        if type is not None:
+            selected &= self._code_mask(self.type_codes, _TYPE_CODES, type)
+        if impact is not None:
+            selected &= self._code_mask(self.impact_codes, _IMPACT_CODES, impact)
+        if confidence is not None:
+            selected &= self._code_mask(
+                self.confidence_codes, _CONFIDENCE_CODES, confidence
+            )
+        if since is not None:
+            selected &= self.detected_at[:n] >= _to_micros(since)
+        if until is not None:
+            selected &= self.detected_at[:n] < _to_micros(until)
+
+        return selected
+
+    def filter(self, **criteria) -> "SignalStore":
+        """Return a new store holding only the rows matching mask(**criteria)"""
+        return self.take(self.mask(**criteria))
+
+    def take(self, mask: np.ndarray) -> "SignalStore":
+        rows = np.flatnonzero(mask)
+        store = SignalStore(capacity=len(rows))
+        store._size = len(rows)
+
+        for name in _NUMERIC_COLUMNS:
+            getattr(store, name)[: len(rows)] = getattr(self, name)[rows]
+
+        # Copy the intern table so company ids stay valid in the new store
+        store.companies = list(self.companies)
+        store._company_ids = dict(self._company_ids)
+
+        for name in _TEXT_COLUMNS:
+            column = getattr(self, name)
+            setattr(store, name, [column[i] for i in rows])
+
+        return store
+
+    def count(self, mask: Optional[np.ndarray] = None) -> int:
+        return self._size if mask is None else int(np.count_nonzero(mask))
+
+    def count_by(
+        self, *keys: str, mask: Optional[np.ndarray] = None
+    ) -> Dict[Union[tuple, object], int]:
+        """Count rows grouped by one or more of GROUP_KEYS.
+
+        With a single key the result is keyed by that value, otherwise by a
+        tuple of values in the order given. Companies are returned by name,
+        enums as members and days as ``date`` objects.
+        """
+        if not keys:
+            raise ValueError("count_by needs at least one key")
+        unknown = set(keys) - set(GROUP_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown group keys: {sorted(unknown)}")
+
+        columns = [self._group_column(key) for key in keys]
+        if mask is not None:
+            columns = [column[mask] for column in columns]
+        if not len(columns[0]):
+            return {}
+
+        # Shift each column to start at zero and combine them into one
+        # mixed-radix int64 key; enum codes and company ids are already dense
+        offsets, radices = [], []
+        combined = np.zeros(len(columns[0]), dtype=np.int64)
+        for column in columns:
+            offset = int(column.min())
+            radix = int(column.max()) - offset + 1
+            combined = combined * radix + (column.astype(np.int64) - offset)
+            offsets.append(offset)
+            radices.append(radix)
+
+        # A dense bincount avoids sorting when the key space is small enough;
+        # fall back to np.unique for sparse combinations (e.g. many days)
+        if math.prod(radices) <= max(4 * len(combined), 1 << 16):
+            all_counts = np.bincount(combined)
+            group_keys = np.flatnonzero(all_counts)
+            counts = all_counts[group_keys]
+        else:
+            group_keys, counts = np.unique(combined, return_counts=True)
+
+        # Split the combined keys back into per-column values, decoding each
+        # distinct value once rather than once per group
+        decoded = []
+        for key, offset, radix in zip(
+            reversed(keys), reversed(offsets), reversed(radices)
+        ):
+            group_keys, index = np.divmod(group_keys, radix)
+            labels = {}
+            values = []
+            for i in index.tolist():
+                label = labels.get(i)
+                if label is None:
+                    label = labels[i] = self._decode(key, i + offset)
+                values.append(label)
+            decoded.append(values)
+        decoded.reverse()
+
+        groups = decoded[0] if len(keys) == 1 else zip(*decoded)
+        return dict(zip(groups, counts.tolist()))
+
+    def _group_column(self, key: str) -> np.ndarray:
+        n = self._size
+        if key == "company":
+            return self.company_ids[:n]
+        if key == "type":
+            return self.type_codes[:n]
+        if key == "impact":
+            return self.impact_codes[:n]
+        if key == "confidence":
+            return self.confidence_codes[:n]
+        return self.detected_at[:n] // _US_PER_DAY
+
+    def _decode(self, key: str, value):
+        if key == "company":
+            return self.companies[value]
+        if key == "type":
+            return SIGNAL_TYPES[value]
+        if key == "impact":
+            return IMPACT_LEVELS[value]
+        if key == "confidence":
+            return CONFIDENCES[value]
+        return date.fromordinal(_EPOCH_ORDINAL + value)
+
+    def _code_mask(self, column: np.ndarray, codes: Dict, values) -> np.ndarray:
+        if not isinstance(values, (list, tuple, set)):
+            values = [values]
+        return np.isin(column[: self._size], [codes[v] for v in values])
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.type_codes)
+        if size <= capacity:
+            return
+
+        # Grow geometrically so appends stay amortized O(1)
+        while capacity < size:
+            capacity *= 2
+
+        for name in _NUMERIC_COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
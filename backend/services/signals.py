@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+from core.supabase import supabase_client
+from models.model import SignalWithMetadata
+from services.aggregates import AggregateService, aggregate_service
+
+SIGNALS_TABLE = "signals"
+# One signal of each type per article; see 20251020_signal_dedupe.sql
+SIGNAL_KEY = "company_name,source_url,signal_type"
+
+
+class SignalRepository:
+    """Writes detected signals to public.signals"""
+
+    def __init__(self, client=None, aggregates: Optional[AggregateService] = None):
+        self.client = client or supabase_client
+        self.aggregates = aggregates or aggregate_service
+
+    def insert_signals(self, signals: List[SignalWithMetadata]) -> int:
+        """Insert new signals in one batch and invalidate cached aggregates.
+
+        Signals already stored for the same article are skipped, so
+        re-scanning a window doesn't count them twice. Returns how many
+        rows were actually inserted.
+        """
+        if not signals:
+            return 0
+
+        rows = [self._to_row(signal) for signal in signals]
+        response = (
+            self.client.table(SIGNALS_TABLE)
+            .upsert(rows, on_conflict=SIGNAL_KEY, ignore_duplicates=True)
+            .execute()
+        )
+
+        # The rollup triggers have run by now; drop stale dashboard aggregates
+        self.aggregates.invalidate()
+        return len(response.data)
+
+    def _to_row(self, signal: SignalWithMetadata) -> dict:
+        return {
+            "company_name": signal.company_name,
+            "signal_type": signal.type.value,
+            "impact": signal.impact.value,
+            "title": signal.title,
+            "action": signal.action,
+            "confidence": signal.confidence.value,
+            "person": signal.person,
+            "amount": signal.amount,
+            "source_url": signal.source_url,
+            "detected_at": signal.detected_at.isoformat(),
+        }
+
+
+signal_repository = SignalRepository()
@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+from loguru import logger
+
+from utils import ModelSpec
+
+
+class BudgetExceeded(Exception):
+    """Raised when the next LLM call would take a run over its budget"""
+
+
+@dataclass
+class TokenUsage:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, input_tokens: int, output_tokens: int, cost: float) -> None:
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost += cost
+
+
+@dataclass
+class Budget:
+    """Token and dollar limits for a single scan run"""
+
+    max_tokens: Optional[int] = None
+    max_cost: Optional[float] = None
+    # Past this fraction of either limit, each call is delayed by throttle_seconds
+    throttle_at: float = 0.8
+    throttle_seconds: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "Budget":
+        """Read limits from SCAN_MAX_TOKENS / SCAN_MAX_COST_USD"""
+        max_tokens = os.getenv("SCAN_MAX_TOKENS")
+        max_cost = os.getenv("SCAN_MAX_COST_USD")
+        return cls(
+            max_tokens=int(max_tokens) if max_tokens else None,
+            max_cost=float(max_cost) if max_cost else None,
+        )
+
+
+@dataclass
+class Reservation:
+    """Projected usage of an in-flight call, held against the budget"""
+
+    tokens: float
+    cost: float
+    settled: bool = False
+
+
+@dataclass
+class ScanRun:
+    """Accumulates LLM usage for one scan and enforces its budget"""
+
+    budget: Budget = field(default_factory=Budget)
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    total: TokenUsage = field(default_factory=TokenUsage)
+    by_company: Dict[str, TokenUsage] = field(default_factory=dict)
+    by_model: Dict[str, TokenUsage] = field(default_factory=dict)
+    signals_by_company: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        # Projected usage of calls that have been reserved but not recorded
+        self._pending_tokens = 0.0
+        self._pending_cost = 0.0
+
+    def reserve(self, spec: ModelSpec, prompt_tokens: int = 0) -> Reservation:
+        """Hold the projected cost of the next call against the budget.
+
+        Throttles or raises BudgetExceeded as needed. The reservation counts
+        toward the budget until it is settled by ``record`` or handed back
+        with ``release``, so concurrent callers can't all pass the same check.
+        """
+        with self._lock:
+            # Project the next call from the average so far; before any call
+            # has completed assume the prompt plus a full-length reply
+            if self.total.calls:
+                next_tokens = self.total.total_tokens / self.total.calls
+                next_cost = self.total.cost / self.total.calls
+            else:
+                next_tokens = prompt_tokens + spec.max_reply_tokens
+                next_cost = spec.cost(prompt_tokens, spec.max_reply_tokens)
+
+            token_share = self._share(
+                self.total.total_tokens + self._pending_tokens + next_tokens,
+                self.budget.max_tokens,
+            )
+            cost_share = self._share(
+                self.total.cost + self._pending_cost + next_cost, self.budget.max_cost
+            )
+
+            if max(token_share, cost_share) > 1:
+                raise BudgetExceeded(
+                    f"Run {self.run_id} would exceed its budget "
+                    f"({self.total.total_tokens} tokens, ${self.total.cost:.4f} "
+                    f"spent, {self._pending_tokens:.0f} tokens in flight)"
+                )
+
+            self._pending_tokens += next_tokens
+            self._pending_cost += next_cost
+            reservation = Reservation(next_tokens, next_cost)
+
+        if max(token_share, cost_share) >= self.budget.throttle_at:
+            logger.debug(f"Run {self.run_id} is near its budget, throttling")
+            time.sleep(self.budget.throttle_seconds)
+
+        return reservation
+
+    def release(self, reservation: Optional[Reservation]) -> None:
+        """Hand back a reservation whose call never reported usage"""
+        with self._lock:
+            self._settle(reservation)
+
+    def record(
+        self,
+        company_name: str,
+        spec: ModelSpec,
+        input_tokens: int,
+        output_tokens: int,
+        reservation: Optional[Reservation] = None,
+    ) -> float:
+        """Record one call's usage, settling its reservation, and return its cost"""
+        cost = spec.cost(input_tokens, output_tokens)
+
+        with self._lock:
+            self._settle(reservation)
+            self.total.add(input_tokens, output_tokens, cost)
+            self.by_company.setdefault(company_name, TokenUsage()).add(
+                input_tokens, output_tokens, cost
+            )
+            self.by_model.setdefault(spec.deployment_name, TokenUsage()).add(
+                input_tokens, output_tokens, cost
+            )
+
+        return cost
+
+    def record_signal(self, company_name: str) -> None:
+        with self._lock:
+            self.signals_by_company[company_name] = (
+                self.signals_by_company.get(company_name, 0) + 1
+            )
+
+    def report(self) -> Dict:
+        """Summarize usage and cost per emitted signal for the run"""
+        signals = sum(self.signals_by_company.values())
+
+        return {
+            "run_id": self.run_id,
+            "total": asdict(self.total),
+            "signals": signals,
+            "cost_per_signal": self.total.cost / signals if signals else None,
+            "by_model": {name: asdict(u) for name, u in self.by_model.items()},
+            "by_company": {
+                name: {
+                    **asdict(usage),
+                    "signals": self.signals_by_company.get(name, 0),
+                }
+                for name, usage in self.by_company.items()
+            },
+        }
+
+    def _settle(self, reservation: Optional[Reservation]) -> None:
+        if reservation is None or reservation.settled:
+            return
+        reservation.settled = True
+        self._pending_tokens -= reservation.tokens
+        self._pending_cost -= reservation.cost
+
+    @staticmethod
+    def _share(value: float, limit: Optional[float]) -> float:
+        if limit is None:
+            return 0.0
+        if limit <= 0:
+            return float("inf")
+        return value / limit
@@ -9,9 +9,10 @@ from models.model import SignalType, ImpactLevel, Confidence
 # Load environment variables
 load_dotenv()
 
-# Skip tests if no API key
+# Skip tests if no API key, unless responses are replayed from an archive
 pytestmark = pytest.mark.skipif(
-    not os.getenv("AZURE_OPENAI_API_KEY"), reason="AZURE_OPENAI_API_KEY not set"
+    not os.getenv("AZURE_OPENAI_API_KEY") and os.getenv("REPLAY_MODE") != "replay",
+    reason="AZURE_OPENAI_API_KEY not set",
 )
 
 
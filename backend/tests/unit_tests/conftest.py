@@ -0,0 +1,159 @@
+import os
+import random
+
+# Settings are read at import time; unit tests never talk to Supabase
+os.environ.setdefault("ALLOWED_ORIGINS", '["http://localhost:3000"]')
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from collections import defaultdict
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage
+
+import agents.signal_detector as signal_detector_module
+from agents.signal_detector import SignalDetector
+from core.metrics import Metrics
+from models.model import Confidence, ImpactLevel, Signal, SignalType
+
+
+class FakeStructuredLLM:
+    """Mimics with_structured_output(..., include_raw=True)"""
+
+    def __init__(self, signal, usage):
+        self.signal = signal
+        self.usage = usage
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        raw = AIMessage(content="", usage_metadata=self.usage)
+        return {"raw": raw, "parsed": self.signal, "parsing_error": None}
+
+
+class FakeQuery:
+    """In-memory stand-in for a supabase-py table query"""
+
+    def __init__(self, table):
+        self.table = table
+        self.filters = []
+        self.orders = []
+        self.bounds = None
+
+    def select(self, columns):
+        return self
+
+    def insert(self, rows):
+        self.table.rows.extend(rows)
+        self.inserted = rows
+        return self
+
+    def upsert(self, rows, on_conflict, ignore_duplicates=False):
+        key = on_conflict.split(",")
+        stored = {tuple(row[k] for k in key) for row in self.table.rows}
+        self.inserted = []
+        for row in rows:
+            values = tuple(row[k] for k in key)
+            # Postgres unique indexes treat NULLs as distinct
+            if None in values or values not in stored:
+                stored.add(values)
+                self.inserted.append(row)
+        self.table.rows.extend(self.inserted)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row[column] == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row[column] >= value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row[column] <= value)
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end + 1)
+        return self
+
+    def execute(self):
+        self.table.executions += 1
+        if hasattr(self, "inserted"):
+            return SimpleNamespace(data=self.inserted)
+        rows = [row for row in self.table.rows if all(f(row) for f in self.filters)]
+        if self.orders:
+            # Like Postgres, ties come back in no particular order
+            random.Random(self.table.executions).shuffle(rows)
+            for column, desc in reversed(self.orders):
+                rows.sort(key=lambda row: row[column], reverse=desc)
+        if self.bounds:
+            rows = rows[self.bounds[0] : self.bounds[1]]
+        return SimpleNamespace(data=rows)
+
+
+class FakeTable:
+    def __init__(self):
+        self.rows = []
+        self.executions = 0
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = defaultdict(FakeTable)
+
+    def table(self, name):
+        return FakeQuery(self.tables[name])
+
+
+class FakeChatModel:
+    def __init__(self, llm):
+        self.llm = llm
+
+    def with_structured_output(self, schema, include_raw=False):
+        return self.llm
+
+
+@pytest.fixture
+def fake_supabase():
+    return FakeSupabase()
+
+
+@pytest.fixture
+def funding_signal():
+    return Signal(
+        type=SignalType.funding,
+        impact=ImpactLevel.high,
+        title="Raised $50M Series B",
+        action="Schedule expansion call this week",
+        confidence=Confidence.high,
+    )
+
+
+@pytest.fixture
+def make_detector(monkeypatch):
+    """Build a SignalDetector whose LLM returns a canned signal and usage.
+
+    Pass chat_model to use a fake model of your own (e.g. a streaming one)
+    instead; the canned signal and usage are then ignored.
+    """
+
+    def factory(signal=None, usage=None, metrics=None, chat_model=None, **kwargs):
+        llm = FakeStructuredLLM(signal, usage)
+        if chat_model is None:
+            chat_model = FakeChatModel(llm)
+        monkeypatch.setattr(
+            signal_detector_module, "azure_chat_model", lambda spec=None: chat_model
+        )
+        detector = SignalDetector(
+            api_key="test", metrics=metrics or Metrics(), **kwargs
+        )
+        return detector, llm
+
+    return factory
@@ -0,0 +1,177 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.cache import TTLCache
+from models.aggregates import RollupBucket
+from models.model import Confidence, ImpactLevel, SignalType, SignalWithMetadata
+import services.aggregates as aggregates_module
+from services.aggregates import ROLLUP_TABLE, AggregateService
+from services.signals import SignalRepository
+
+
+def rollup_row(company, signal_type, day, count, impact="high"):
+    return {
+        "company_name": company,
+        "signal_type": signal_type,
+        "impact": impact,
+        "bucket": day,
+        "signal_count": count,
+    }
+
+
+@pytest.fixture
+def service(fake_supabase):
+    fake_supabase.tables[ROLLUP_TABLE].rows = [
+        rollup_row("Acme", "funding", "2025-07-21", 2),
+        rollup_row("Acme", "funding", "2025-07-22", 1),
+        rollup_row("Acme", "layoffs", "2025-07-23", 4),
+        rollup_row("Globex", "funding", "2025-07-22", 5),
+        rollup_row("Globex", "funding", "2025-06-30", 9),
+    ]
+    return AggregateService(
+        client=fake_supabase, cache=TTLCache("aggregates", ttl_seconds=60)
+    )
+
+
+def test_rollups_are_filtered_and_rebucketed(service):
+    rollups = service.get_rollups(
+        since=date(2025, 7, 1),
+        signal_type=SignalType.funding,
+        bucket=RollupBucket.week,
+    )
+
+    assert [(r.company_name, r.bucket, r.count) for r in rollups] == [
+        ("Globex", date(2025, 7, 21), 5),
+        ("Acme", date(2025, 7, 21), 3),
+        ("Globex", date(2025, 6, 30), 9),
+    ]
+
+
+def test_oldest_bucket_is_counted_in_full(service):
+    # 2025-07-23 is a Wednesday; its week starts on the 21st
+    rollups = service.get_rollups(
+        since=date(2025, 7, 23), company_name="Acme", bucket=RollupBucket.week
+    )
+
+    assert sorted((r.signal_type, r.count) for r in rollups) == [
+        (SignalType.funding, 3),
+        (SignalType.layoffs, 4),
+    ]
+
+
+def test_paging_counts_every_row_once(monkeypatch, fake_supabase):
+    monkeypatch.setattr(aggregates_module, "PAGE_SIZE", 4)
+    companies = ["Acme", "Globex", "Initech", "Umbrella"]
+    impacts = ["high", "medium", "low"]
+    fake_supabase.tables[ROLLUP_TABLE].rows = [
+        rollup_row(company, "funding", day, 1, impact)
+        for day in ("2025-07-21", "2025-07-22")
+        for company in companies
+        for impact in impacts
+    ]
+    service = AggregateService(
+        client=fake_supabase, cache=TTLCache("aggregates", ttl_seconds=60)
+    )
+
+    rollups = service.get_rollups(since=date(2025, 7, 21), bucket=RollupBucket.week)
+
+    assert len(rollups) == len(companies) * len(impacts)
+    assert all(r.count == 2 for r in rollups)
+
+
+def test_cache_serves_repeat_reads_until_signals_are_written(service, fake_supabase):
+    table = fake_supabase.tables[ROLLUP_TABLE]
+    repository = SignalRepository(client=fake_supabase, aggregates=service)
+
+    first = service.get_rollups(since=date(2025, 7, 1))
+    assert service.get_rollups(since=date(2025, 7, 1)) == first
+    assert table.executions == 1
+
+    repository.insert_signals(
+        [
+            SignalWithMetadata(
+                type=SignalType.funding,
+                impact=ImpactLevel.high,
+                title="Raised $50M",
+                action="Call",
+                confidence=Confidence.high,
+                company_name="Acme",
+                detected_at=datetime(2025, 7, 23),
+            )
+        ]
+    )
+    service.get_rollups(since=date(2025, 7, 1))
+
+    assert table.executions == 2
+    assert fake_supabase.tables["signals"].rows[0]["signal_type"] == "funding"
+
+
+def test_rescanned_articles_are_not_inserted_twice(service, fake_supabase):
+    repository = SignalRepository(client=fake_supabase, aggregates=service)
+    signal = SignalWithMetadata(
+        type=SignalType.funding,
+        impact=ImpactLevel.high,
+        title="Raised $50M",
+        action="Call",
+        confidence=Confidence.high,
+        company_name="Acme",
+        source_url="https://example.com/acme-raises",
+    )
+
+    assert repository.insert_signals([signal]) == 1
+    assert repository.insert_signals([signal.model_copy()]) == 0
+    assert len(fake_supabase.tables["signals"].rows) == 1
+
+
+def test_stale_result_is_not_cached_after_invalidation():
+    cache = TTLCache("test", ttl_seconds=60)
+
+    generation = cache.generation
+    cache.invalidate()
+    cache.set("key", "stale", generation=generation)
+
+    assert cache.get("key") is None
+
+
+def test_aggregates_endpoint(monkeypatch, fake_supabase):
+    import main
+    from api import signals as signals_api
+
+    today = date.today()
+    fake_supabase.tables[ROLLUP_TABLE].rows = [
+        rollup_row("Acme", "funding", today.isoformat(), 2),
+        rollup_row("Acme", "layoffs", today.isoformat(), 4),
+        rollup_row("Globex", "funding", today.isoformat(), 5),
+        rollup_row("Acme", "funding", (today - timedelta(days=60)).isoformat(), 7),
+    ]
+    service = AggregateService(
+        client=fake_supabase, cache=TTLCache("aggregates", ttl_seconds=60)
+    )
+    monkeypatch.setattr(signals_api, "aggregate_service", service)
+
+    async def signed_in(token):
+        return None
+
+    monkeypatch.setattr(signals_api.auth_service, "get_current_user", signed_in)
+    client = TestClient(main.app)
+    params = {"days": 30, "company": "Acme"}
+
+    assert client.get("/api/signals/aggregates", params=params).status_code in (
+        401,
+        403,
+    )
+    response = client.get(
+        "/api/signals/aggregates",
+        params=params,
+        headers={"Authorization": "Bearer token"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bucket"] == "day"
+    assert {(r["signal_type"], r["count"]) for r in body["rollups"]} == {
+        ("funding", 2),
+        ("layoffs", 4),
+    }
@@ -0,0 +1,174 @@
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from prometheus_client import CollectorRegistry
+
+from core.metrics import Metrics, PrometheusMetrics
+from services.article_enricher import (
+    ArticleEnricher,
+    extract_main_text,
+    interstitial_target,
+    publisher_url,
+    truncate_to_tokens,
+)
+
+PARAGRAPH = "Acme Corp named Jane Doe as its new chief executive officer on Monday."
+PAGE = f"""
+<html><body>
+  <nav>Home | News | Markets</nav>
+  <article>
+    <p>{PARAGRAPH}</p>
+    <p>Share this</p>
+    <p>The company also closed a $50 million Series B round led by Sequoia.</p>
+  </article>
+  <script>track()</script>
+</body></html>
+"""
+
+
+PUBLISHER_URL = "https://www.reuters.com/business/acme-raises-50m-2025-07-22/"
+OPAQUE_LINK = "https://news.google.com/rss/articles/AU_yqLOpaque?oc=5"
+
+
+def google_news_link(url: str) -> str:
+    """Wrap a URL the way older Google News RSS article ids do"""
+    payload = b"\x08\x13\x22" + bytes([len(url)]) + url.encode() + b"\xd2\x01\x00"
+    article_id = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"https://news.google.com/rss/articles/{article_id}?oc=5"
+
+
+def interstitial(url: str) -> str:
+    """Google News page for an opaque article id, pointing at url"""
+    return f"""
+    <html><head><link rel="canonical" href="https://news.google.com/a/x"></head>
+    <body><a href="https://policies.google.com/privacy">Privacy</a>
+    <c-wiz><div jscontroller="aLI87" data-n-au="{url}"></div></c-wiz></body></html>
+    """
+
+
+def make_enricher(handler, metrics=None, **kwargs):
+    return ArticleEnricher(
+        executor=ThreadPoolExecutor(max_workers=2),
+        metrics=metrics or Metrics(),
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def test_extract_main_text_drops_boilerplate():
+    text = extract_main_text(PAGE)
+
+    assert text.splitlines() == [
+        PARAGRAPH,
+        "The company also closed a $50 million Series B round led by Sequoia.",
+    ]
+
+
+def test_extract_main_text_ignores_pages_without_paragraphs():
+    interstitial = "<html><body><div>Google News</div><a>Opening...</a></body></html>"
+    assert extract_main_text(interstitial) == ""
+
+
+def test_publisher_url_unwraps_google_news_links():
+    assert publisher_url(google_news_link(PUBLISHER_URL)) == PUBLISHER_URL
+    assert publisher_url("https://news.google.com/rss/articles/AU_yqLOpaque") is None
+    assert publisher_url("https://example.com/a") == "https://example.com/a"
+
+
+def test_enrich_fetches_the_publisher_page():
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(200, html=PAGE)
+
+    articles = [{"link": google_news_link(PUBLISHER_URL), "text": "Acme raises."}]
+    make_enricher(handler).enrich_articles(articles)
+
+    assert requests == [PUBLISHER_URL]
+    assert PARAGRAPH in articles[0]["body"]
+
+
+def test_interstitial_target_skips_google_links():
+    assert interstitial_target(interstitial(PUBLISHER_URL)) == PUBLISHER_URL
+    refresh = f'<meta http-equiv="refresh" content="0;URL=\'{PUBLISHER_URL}\'">'
+    assert interstitial_target(refresh) == PUBLISHER_URL
+    assert interstitial_target(interstitial("")) is None
+
+
+def test_enrich_resolves_opaque_links_through_the_interstitial():
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        if request.url.host == "news.google.com":
+            return httpx.Response(200, html=interstitial(PUBLISHER_URL))
+        return httpx.Response(200, html=PAGE)
+
+    enricher = make_enricher(handler)
+    articles = [{"link": OPAQUE_LINK, "text": "Acme raises."}]
+    enricher.enrich_articles(articles)
+    enricher.enrich_articles([{"link": OPAQUE_LINK, "text": "Acme raises."}])
+
+    assert requests == [OPAQUE_LINK, PUBLISHER_URL]
+    assert PARAGRAPH in articles[0]["body"]
+
+
+def test_unresolved_opaque_links_are_counted():
+    metrics = PrometheusMetrics(registry=CollectorRegistry())
+
+    def handler(request):
+        return httpx.Response(200, html=interstitial(""))
+
+    articles = [{"link": OPAQUE_LINK, "text": "Acme raises."}]
+
+    make_enricher(handler, metrics=metrics).enrich_articles(articles)
+
+    assert "body" not in articles[0]
+    skipped = metrics.registry.get_sample_value(
+        "insights_articles_skipped_total", {"reason": "opaque_link"}
+    )
+    assert skipped == 1
+
+
+def test_truncate_to_tokens_ends_on_word_boundary():
+    assert truncate_to_tokens("one two three four", 2) == "one two"
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_enrich_appends_bodies_and_caches_by_url():
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, html=PAGE)
+
+    enricher = make_enricher(handler, max_body_tokens=10)
+    articles = [
+        {"link": "https://example.com/a", "text": "Acme names CEO."},
+        {"link": "https://example.com/missing", "text": "Acme news."},
+    ]
+
+    enricher.enrich_articles(articles)
+    enricher.enrich_articles([{"link": "https://example.com/a", "text": "again"}])
+
+    assert articles[0]["body"] == truncate_to_tokens(PARAGRAPH, 10)
+    assert articles[0]["text"].startswith("Acme names CEO.\n\nAcme Corp named")
+    assert "body" not in articles[1]
+    assert requests == ["https://example.com/a", "https://example.com/missing"]
+
+
+def test_enrich_skips_non_html_responses():
+    enricher = make_enricher(
+        lambda request: httpx.Response(
+            200, content=b"%PDF", headers={"content-type": "application/pdf"}
+        )
+    )
+    articles = [{"link": "https://example.com/report.pdf", "text": "Report"}]
+
+    enricher.enrich_articles(articles)
+
+    assert articles[0]["text"] == "Report"
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.model import SignalType
+from services.extraction_queue import ExtractionQueue, keyword_hint, score_article
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def article(text: str, hours_old: float = 0) -> dict:
+    return {"text": text, "pub_date": datetime.now() - timedelta(hours=hours_old)}
+
+
+def drain_texts(queue: ExtractionQueue):
+    return [item.article["text"] for item, _ in queue.drain(lambda item: None)]
+
+
+def test_keyword_hint_picks_highest_weight():
+    assert keyword_hint("CEO resigns after acquisition talks fail")[1] == 3.0
+    assert keyword_hint("Startup raises Series B")[0] == SignalType.funding
+    assert keyword_hint("Quarterly picnic photos") == (None, 0.0)
+
+
+def test_score_prefers_fresh_high_impact_and_top_tier():
+    fresh, _ = score_article(article("Company announces layoffs"))
+    stale, _ = score_article(article("Company announces layoffs", hours_old=72))
+    bland, _ = score_article(article("Company hosts webinar"))
+    strategic, _ = score_article(article("Company hosts webinar"), tier="strategic")
+
+    assert fresh > stale
+    assert fresh > bland
+    assert strategic > bland
+
+
+def test_dispatches_highest_priority_first():
+    queue = ExtractionQueue(clock=FakeClock())
+    queue.push("Acme", article("Acme hosts webinar"))
+    queue.push("Acme", article("Acme raises Series C"))
+    queue.push("Acme", article("Acme CEO steps down"))
+
+    assert drain_texts(queue) == [
+        "Acme CEO steps down",
+        "Acme raises Series C",
+        "Acme hosts webinar",
+    ]
+    assert len(queue) == 0
+
+
+def test_tier_breaks_ties_between_companies():
+    queue = ExtractionQueue(tiers={"Beta": "strategic"}, clock=FakeClock())
+    queue.push("Alpha", article("Alpha opens new office"))
+    queue.push("Beta", article("Beta opens new office"))
+
+    assert queue.pop().company_name == "Beta"
+
+
+def test_aging_prevents_starvation():
+    clock = FakeClock()
+    queue = ExtractionQueue(aging_per_second=0.1, clock=clock)
+    queue.push("Acme", article("Acme hosts webinar"))
+
+    # A stream of urgent work keeps arriving after the bland item waited
+    clock.now = 60
+    for _ in range(3):
+        queue.push("Acme", article("Acme announces layoffs"))
+
+    assert queue.pop().article["text"] == "Acme hosts webinar"
+
+
+def test_near_deadline_item_jumps_the_queue():
+    clock = FakeClock()
+    queue = ExtractionQueue(
+        aging_per_second=0,
+        deadline_seconds=100,
+        urgent_deadline_seconds=1000,
+        urgency_window_seconds=10,
+        clock=clock,
+    )
+    queue.push("Acme", article("Acme hosts webinar"))
+    queue.push("Acme", article("Acme CEO steps down"))
+
+    assert queue.pop().article["text"] == "Acme CEO steps down"
+    assert len(queue) == 1
+    queue.push("Acme", article("Acme CEO steps down again"))
+
+    clock.now = 95
+    assert queue.pop().article["text"] == "Acme hosts webinar"
+
+
+def test_drop_expired_skips_overdue_items():
+    clock = FakeClock()
+    queue = ExtractionQueue(deadline_seconds=10, drop_expired=True, clock=clock)
+    queue.push("Acme", article("Acme hosts webinar"))
+
+    clock.now = 20
+    assert queue.pop() is None
+    assert len(queue) == 0
+
+
+def test_drain_stops_all_workers_on_error():
+    queue = ExtractionQueue(clock=FakeClock())
+    for i in range(20):
+        queue.push("Acme", article(f"Acme news {i}"))
+
+    handled = []
+
+    def handle(item):
+        handled.append(item)
+        if len(handled) == 3:
+            raise RuntimeError("budget")
+
+    with pytest.raises(RuntimeError):
+        queue.drain(handle, concurrency=4)
+
+    assert len(handled) < 20
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from supabase import create_client
+from supabase.lib.client_options import SyncClientOptions
+
+from benchmarks.fake_supabase import LOAD_TEST_PASSWORD, create_app, load_test_email
+from benchmarks.load_test import (
+    baseline_thresholds,
+    check_thresholds,
+    parse_mix,
+    percentile,
+    summarize,
+)
+from models.auth import UserLogin
+from services.auth import AuthService
+
+
+def test_auth_service_against_fake_supabase():
+    http = TestClient(create_app(users=2))
+    service = AuthService()
+    service.client = create_client(
+        "http://fake-supabase",
+        "fake-anon-key",
+        SyncClientOptions(httpx_client=http, auto_refresh_token=False),
+    )
+
+    login = UserLogin(email=load_test_email(1), password=LOAD_TEST_PASSWORD)
+    token = asyncio.run(service.login_user(login))
+    user = asyncio.run(service.get_current_user(token.access_token))
+    assert user.email == load_test_email(1)
+    assert user.full_name == "User 1"
+
+    with pytest.raises(HTTPException):
+        asyncio.run(service.get_current_user("not-a-token"))
+    with pytest.raises(HTTPException):
+        asyncio.run(
+            service.login_user(UserLogin(email=load_test_email(0), password="wrong"))
+        )
+
+
+def test_parse_mix():
+    assert parse_mix("login=1, me=4,health") == {"login": 1, "me": 4, "health": 1}
+    with pytest.raises(ValueError):
+        parse_mix("register=1")
+
+
+def test_summary_and_thresholds():
+    assert percentile(list(range(1, 101)), 50) == 50
+    assert percentile(list(range(1, 101)), 99) == 99
+
+    samples = {
+        "health": [(0.010, True)] * 99 + [(0.500, True)],
+        "me": [(0.050, True)] * 9 + [(0.050, False)],
+    }
+    summary = summarize(samples, elapsed=2.0)
+    assert summary["health"]["rps"] == 50
+    assert summary["health"]["p99_ms"] == pytest.approx(10)
+    assert summary["health"]["max_ms"] == pytest.approx(500)
+    assert summary["me"]["error_rate"] == pytest.approx(0.1)
+
+    thresholds = {
+        "max_error_rate": 0.05,
+        "routes": {"health": {"p99_ms": 20, "min_rps": 40}, "me": {"p50_ms": 10}},
+    }
+    failures = check_thresholds(summary, thresholds)
+    assert len(failures) == 2
+    assert all(failure.startswith("me:") for failure in failures)
+
+
+def test_baseline_comparison():
+    baseline = {
+        "me": {"error_rate": 0.0, "rps": 100.0, "p50_ms": 40.0, "p99_ms": 90.0},
+    }
+    thresholds = baseline_thresholds(baseline, tolerance=0.5)
+    assert thresholds["max_error_rate"] == 0.01
+    assert thresholds["routes"]["me"] == {
+        "p50_ms": 60.0,
+        "p99_ms": 135.0,
+        "min_rps": 66.7,
+    }
+
+    slower = {"me": {**baseline["me"], "p99_ms": 140.0}}
+    assert check_thresholds(baseline, thresholds) == []
+    assert check_thresholds(slower, thresholds) == ["me: p99_ms 140.0 > 135.0"]
@@ -0,0 +1,115 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry
+
+from api import metrics as metrics_api
+from core.metrics import Metrics, PrometheusMetrics, set_metrics
+
+
+@pytest.fixture
+def prometheus():
+    backend = PrometheusMetrics(registry=CollectorRegistry())
+    set_metrics(backend)
+    yield backend
+    set_metrics(Metrics())
+
+
+def sample(backend, name, **labels):
+    return backend.registry.get_sample_value(f"insights_{name}", labels) or 0
+
+
+def test_noop_backend_accepts_everything():
+    backend = Metrics()
+
+    backend.inc("articles_fetched_total", 3, source="google_news")
+    with backend.timer("stage_seconds", component="x", stage="y"):
+        pass
+
+    assert backend.render() == b""
+
+
+def test_prometheus_backend_records_counters_and_histograms(prometheus):
+    prometheus.inc("articles_fetched_total", 3, source="google_news")
+    with prometheus.timer("stage_seconds", component="news_fetcher", stage="fetch"):
+        pass
+
+    assert sample(prometheus, "articles_fetched_total", source="google_news") == 3
+    assert (
+        sample(
+            prometheus, "stage_seconds_count", component="news_fetcher", stage="fetch"
+        )
+        == 1
+    )
+    assert b"insights_articles_fetched_total" in prometheus.render()
+
+
+def test_detector_records_tokens_and_outcome(make_detector, funding_signal, prometheus):
+    usage = {
+        "input_tokens": 120,
+        "output_tokens": 30,
+        "total_tokens": 150,
+        "input_token_details": {"cache_read": 64},
+    }
+    detector, _ = make_detector(funding_signal, usage, prometheus)
+
+    assert detector.extract("Acme", "Acme raised $50M") == funding_signal
+    assert sample(prometheus, "llm_tokens_total", direction="input") == 120
+    assert sample(prometheus, "llm_tokens_total", direction="output") == 30
+    assert sample(prometheus, "cache_hits_total", cache="llm_prompt") == 1
+    assert sample(prometheus, "extractions_total", outcome="emitted") == 1
+    assert sample(prometheus, "signals_extracted_total", type="funding") == 1
+
+
+def test_http_requests_are_labelled_by_route_template(prometheus):
+    app = FastAPI()
+    app.add_middleware(metrics_api.RequestMetricsMiddleware)
+    app.include_router(metrics_api.router)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert (
+        sample(
+            prometheus,
+            "http_requests_total",
+            method="GET",
+            route="/items/{item_id}",
+            status="200",
+        )
+        == 2
+    )
+
+
+def test_unhandled_errors_are_counted_as_500(prometheus):
+    app = FastAPI()
+    app.add_middleware(metrics_api.RequestMetricsMiddleware)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    response = TestClient(app, raise_server_exceptions=False).get("/boom")
+
+    assert response.status_code == 500
+    labels = {"method": "GET", "route": "/boom"}
+    assert sample(prometheus, "http_requests_total", status="500", **labels) == 1
+    assert sample(prometheus, "http_request_seconds_count", **labels) == 1
+
+
+def test_disabled_metrics_pass_requests_through():
+    app = FastAPI()
+    app.add_middleware(metrics_api.RequestMetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    assert TestClient(app).get("/items/1").json() == {"id": 1}
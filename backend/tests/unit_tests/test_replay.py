@@ -0,0 +1,145 @@
+import time
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from urllib.parse import unquote_plus
+
+import httpx
+import pytest
+
+import agents.signal_detector as signal_detector_module
+import services.replay as replay_module
+from demo_runner import run_demo
+from services.news_fetcher import NewsFetcher
+from services.replay import ReplayArchive, ReplayMiss, ReplayMode, archive_key
+
+
+def rss(*items):
+    entries = "".join(
+        f"<item><title>{title} - Wire</title><link>https://example.com/{i}</link>"
+        f"<pubDate>{format_datetime(published)}</pubDate></item>"
+        for i, (title, published) in enumerate(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'
+
+
+def test_archive_round_trip_and_reopen(tmp_path):
+    archive = ReplayArchive(tmp_path, ReplayMode.record)
+    archive.put("a", b"first")
+    archive.put_json("b", {"x": 1})
+    archive.put("a", b"second")
+    archive.close()
+
+    replay = ReplayArchive(tmp_path, ReplayMode.replay)
+    assert len(replay) == 2
+    assert replay.get("a") == b"second"
+    assert replay.get_json("b") == {"x": 1}
+    with pytest.raises(ReplayMiss):
+        replay.get("missing")
+
+
+def test_archive_ignores_torn_index_tail(tmp_path):
+    archive = ReplayArchive(tmp_path, ReplayMode.record)
+    archive.put("a", b"payload")
+    archive.close()
+    with open(tmp_path / "index.jsonl", "a") as f:
+        f.write('{"key": "b", "offs')
+
+    assert list(ReplayArchive(tmp_path, ReplayMode.replay)._index) == ["a"]
+
+
+def test_fetcher_replays_recorded_feed(tmp_path, monkeypatch):
+    now = datetime.now()
+    body = rss(("Acme raises $50M", now), ("Acme old news", now - timedelta(days=30)))
+    monkeypatch.setattr(
+        httpx,
+        "get",
+        lambda url, **kwargs: httpx.Response(
+            200, content=body.encode(), request=httpx.Request("GET", url)
+        ),
+    )
+
+    recorder = ReplayArchive(tmp_path, ReplayMode.record)
+    recorded = NewsFetcher(archive=recorder).fetch_multiple_sources("Acme")
+    recorder.close()
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("replay must not hit the network")
+
+    monkeypatch.setattr(httpx, "get", no_network)
+    replayed = NewsFetcher(
+        archive=ReplayArchive(tmp_path, ReplayMode.replay)
+    ).fetch_multiple_sources("Acme")
+
+    assert [a["title"] for a in replayed] == ["Acme raises $50M - Wire"]
+    assert [a["link"] for a in replayed] == [a["link"] for a in recorded]
+
+
+def test_detector_replays_llm_response(tmp_path, make_detector, funding_signal):
+    usage = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+    recorder = ReplayArchive(tmp_path, ReplayMode.record)
+    detector, llm = make_detector(funding_signal, usage, archive=recorder)
+    assert detector.extract("Acme", "Acme raised $50M") == funding_signal
+    recorder.close()
+
+    replay = ReplayArchive(tmp_path, ReplayMode.replay)
+    replayed, replay_llm = make_detector(None, usage, archive=replay)
+    assert replayed.extract("Acme", "Acme raised $50M") == funding_signal
+    assert replay_llm.calls == 0
+    assert archive_key("llm", "gpt-4o-mini", "other") not in replay
+    with pytest.raises(ReplayMiss):
+        replayed.extract("Acme", "something else")
+
+
+def test_fetcher_raises_on_unrecorded_feed(tmp_path):
+    fetcher = NewsFetcher(archive=ReplayArchive(tmp_path, ReplayMode.replay))
+    with pytest.raises(ReplayMiss):
+        fetcher.fetch_google_news("Acme")
+
+
+def test_demo_scan_replays_without_network(
+    tmp_path, monkeypatch, make_detector, funding_signal
+):
+    companies = ["Acme", "Globex", "Initech"]
+    now = datetime.now()
+
+    def feed(url, **kwargs):
+        company = next(c for c in companies if f'"{c}"' in unquote_plus(url))
+        body = rss(
+            (f"{company} raises $50M", now),
+            (f"{company} hires a new CFO", now - timedelta(days=1)),
+        )
+        return httpx.Response(
+            200, content=body.encode(), request=httpx.Request("GET", url)
+        )
+
+    usage = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+    monkeypatch.setenv("REPLAY_DIR", str(tmp_path))
+    monkeypatch.setenv("REPLAY_MODE", "record")
+    monkeypatch.setattr(replay_module, "_archive", None)
+    monkeypatch.setattr(httpx, "get", feed)
+    _, llm = make_detector(funding_signal, usage)
+    recorded = run_demo(companies)
+    replay_module._archive.close()
+    assert llm.calls == 6
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("replay must not hit the network")
+
+    monkeypatch.setenv("REPLAY_MODE", "replay")
+    monkeypatch.setattr(replay_module, "_archive", None)
+    monkeypatch.setattr(httpx, "get", no_network)
+    monkeypatch.setattr(signal_detector_module, "azure_chat_model", no_network)
+    monkeypatch.delenv("OPENAI_API_KEY")
+
+    started = time.perf_counter()
+    replayed = run_demo(companies)
+    elapsed = time.perf_counter() - started
+
+    replay_module._archive.close()
+    assert elapsed < 5
+    assert len(replayed) == 6
+    # Everything but the detection time comes from the archive
+    assert [s.model_dump(exclude={"detected_at"}) for s in replayed.to_signals()] == [
+        s.model_dump(exclude={"detected_at"}) for s in recorded.to_signals()
+    ]
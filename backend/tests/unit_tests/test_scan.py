@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from models.model import Confidence, ImpactLevel, SignalType, SignalWithMetadata
+from models.scan import ScanStatus
+from services.scan import ScanService
+
+
+class BlockingScanner:
+    """Scanner that blocks until released, counting how often it runs"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, company_name):
+        self.calls.append(company_name)
+        self.release.wait(5)
+        signal = SignalWithMetadata(
+            type=SignalType.funding,
+            impact=ImpactLevel.high,
+            title=f"{company_name} raised $50M",
+            action="Call",
+            confidence=Confidence.high,
+            company_name=company_name,
+            detected_at=datetime(2025, 7, 22),
+        )
+        return [signal], {"signals": 1}, 1
+
+
+def test_concurrent_requests_share_one_job():
+    scanner = BlockingScanner()
+    service = ScanService(scanner=scanner, freshness_seconds=60)
+
+    async def scenario():
+        jobs = [service.submit(name) for name in ("Acme", "acme ", "ACME")]
+        assert len({job.job_id for job in jobs}) == 1
+
+        waiter = asyncio.create_task(service.wait(jobs[0].job_id, timeout=5))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        scanner.release.set()
+        finished = await waiter
+        assert finished.status == ScanStatus.completed
+        assert finished.signals[0].title == "Acme raised $50M"
+
+        again = service.submit("Acme")
+        assert again.cached
+        assert again.job_id == jobs[0].job_id
+
+    asyncio.run(scenario())
+    assert scanner.calls == ["Acme"]
+
+
+def test_stale_results_trigger_a_new_scan():
+    scanner = BlockingScanner()
+    scanner.release.set()
+    service = ScanService(scanner=scanner, freshness_seconds=0)
+
+    async def scenario():
+        first = service.submit("Acme")
+        await service.wait(first.job_id, timeout=5)
+        second = service.submit("Acme")
+        await service.wait(second.job_id, timeout=5)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.job_id != second.job_id
+    assert len(scanner.calls) == 2
+
+
+def test_failed_scan_is_reported_and_not_cached():
+    def failing(company_name):
+        raise RuntimeError("feed unavailable")
+
+    service = ScanService(scanner=failing, freshness_seconds=60)
+
+    async def scenario():
+        job = service.submit("Acme")
+        job = await service.wait(job.job_id, timeout=5)
+        return job, service.submit("Acme")
+
+    job, retry = asyncio.run(scenario())
+    assert job.status == ScanStatus.failed
+    assert job.error == "feed unavailable"
+    assert retry.job_id != job.job_id
+
+
+def test_empty_fetch_is_not_cached():
+    def empty(company_name):
+        return [], {"signals": 0}, 0
+
+    service = ScanService(scanner=empty, freshness_seconds=60)
+
+    async def scenario():
+        job = service.submit("Acme")
+        job = await service.wait(job.job_id, timeout=5)
+        return job, service.submit("Acme")
+
+    job, retry = asyncio.run(scenario())
+    assert job.status == ScanStatus.completed
+    assert not retry.cached
+    assert retry.job_id != job.job_id
+
+
+def test_scan_endpoints(monkeypatch):
+    import main
+    from api import scan as scan_api
+
+    scanner = BlockingScanner()
+    scanner.release.set()
+    monkeypatch.setattr(
+        scan_api, "scan_service", ScanService(scanner=scanner, freshness_seconds=60)
+    )
+
+    async def signed_in(token):
+        return None
+
+    monkeypatch.setattr(scan_api.auth_service, "get_current_user", signed_in)
+
+    with TestClient(main.app) as client:
+        assert client.post("/api/scan/Acme").status_code in (401, 403)
+
+        headers = {"Authorization": "Bearer token"}
+        started = client.post("/api/scan/Acme", headers=headers)
+        assert started.status_code == 202
+        job_id = started.json()["job_id"]
+
+        assert client.get(f"/api/scan/jobs/{job_id}").status_code in (401, 403)
+        finished = client.get(
+            f"/api/scan/jobs/{job_id}", params={"wait": 5}, headers=headers
+        )
+        assert finished.json()["status"] == "completed"
+
+        cached = client.post("/api/scan/Acme", headers=headers)
+        assert cached.status_code == 200
+        assert cached.json()["cached"] is True
+
+        unknown = client.get("/api/scan/jobs/unknown", headers=headers)
+        assert unknown.status_code == 404
@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from models.model import Confidence, ImpactLevel, SignalType, SignalWithMetadata
+from services.signal_store import SignalStore
+
+NOW = datetime(2025, 7, 22, 12, 30)
+
+
+def make_signal(company, signal_type, impact=ImpactLevel.high, days_ago=0, **extra):
+    return SignalWithMetadata(
+        type=signal_type,
+        impact=impact,
+        title=f"{company} {signal_type.value}",
+        action="Follow up",
+        confidence=Confidence.high,
+        company_name=company,
+        detected_at=NOW - timedelta(days=days_ago),
+        **extra,
+    )
+
+
+@pytest.fixture
+def signals():
+    return [
+        make_signal("Acme", SignalType.funding, amount="$50M"),
+        make_signal("Acme", SignalType.leadership, person="Jane Doe, CEO"),
+        make_signal("Acme", SignalType.funding, ImpactLevel.medium, days_ago=1),
+        make_signal("Globex", SignalType.layoffs, days_ago=1),
+        make_signal(
+            "Globex",
+            SignalType.funding,
+            ImpactLevel.low,
+            days_ago=3,
+            source_url="https://example.com",
+            article_date=datetime(2025, 7, 18),
+        ),
+    ]
+
+
+def test_round_trips_models(signals):
+    store = SignalStore(capacity=2)
+    for signal in signals:
+        store.append(signal)
+
+    assert len(store) == 5
+    assert store.companies == ["Acme", "Globex"]
+    assert store.to_signals() == signals
+
+
+def test_rejects_aware_datetimes(signals):
+    store = SignalStore.from_signals(signals[:1])
+    aware = make_signal("Initech", SignalType.funding).model_copy(
+        update={"article_date": datetime(2025, 7, 18, tzinfo=timezone.utc)}
+    )
+
+    with pytest.raises(ValueError):
+        store.extend([signals[1], aware])
+    with pytest.raises(ValueError):
+        store.mask(since=NOW.replace(tzinfo=timezone.utc))
+
+    assert store.to_signals() == signals[:1]
+    assert store.companies == ["Acme"]
+
+
+def test_detector_article_dates_with_offsets_are_stored(make_detector, funding_signal):
+    detector, _ = make_detector(funding_signal, usage=None)
+    published = datetime(2025, 7, 18, 8, tzinfo=timezone.utc)
+
+    signal = detector.extract_with_metadata(
+        "Acme", "text", article_date=published.isoformat()
+    )
+    store = SignalStore.from_signals([signal])
+
+    assert store.get(0).article_date == published.astimezone().replace(tzinfo=None)
+
+
+def test_count_by_single_and_multiple_keys(signals):
+    store = SignalStore.from_signals(signals)
+
+    assert store.count_by("type") == {
+        SignalType.funding: 3,
+        SignalType.layoffs: 1,
+        SignalType.leadership: 1,
+    }
+    assert store.count_by("company", "day") == {
+        ("Acme", date(2025, 7, 22)): 2,
+        ("Acme", date(2025, 7, 21)): 1,
+        ("Globex", date(2025, 7, 21)): 1,
+        ("Globex", date(2025, 7, 19)): 1,
+    }
+
+
+def test_mask_and_filter(signals):
+    store = SignalStore.from_signals(signals)
+
+    mask = store.mask(
+        type=SignalType.funding,
+        impact=[ImpactLevel.high, ImpactLevel.medium],
+        since=NOW - timedelta(days=2),
+    )
+    assert store.count(mask) == 2
+    assert store.count_by("company", mask=mask) == {"Acme": 2}
+
+    globex = store.filter(company="Globex")
+    assert [s.type for s in globex.to_signals()] == [
+        SignalType.layoffs,
+        SignalType.funding,
+    ]
+    assert store.count(store.mask(company="Initech")) == 0
+
+
+def test_count_by_rejects_unknown_key(signals):
+    with pytest.raises(ValueError):
+        SignalStore.from_signals(signals).count_by("title")
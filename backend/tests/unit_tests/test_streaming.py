@@ -0,0 +1,137 @@
+import time
+
+from langchain_core.messages import AIMessageChunk
+
+from agents.streaming import JsonFieldScanner, StreamingStructuredLLM
+from models.model import Confidence, ImpactLevel, Signal, SignalType
+from services.replay import ReplayArchive, ReplayMode
+from services.usage import ScanRun
+
+CHUNK_DELAY = 0.002
+
+
+class FakeStreamingChatModel:
+    """Streams a JSON reply a few characters per chunk, like a real model"""
+
+    def __init__(self, reply: str, chunk_chars: int = 4):
+        self.reply = reply
+        self.pieces = [
+            reply[i : i + chunk_chars] for i in range(0, len(reply), chunk_chars)
+        ]
+        self.usage = {
+            "input_tokens": 300,
+            "output_tokens": len(self.pieces),
+            "total_tokens": 300 + len(self.pieces),
+        }
+        self.sent = 0
+        self.closed = False
+
+    def bind(self, **kwargs):
+        self.bound = kwargs
+        return self
+
+    def stream(self, prompt):
+        try:
+            for piece in self.pieces:
+                time.sleep(CHUNK_DELAY)
+                self.sent += 1
+                yield AIMessageChunk(content=piece)
+            yield AIMessageChunk(content="", usage_metadata=self.usage)
+            # The OpenAI client ends with the full completion again
+            yield AIMessageChunk(content=self.reply, usage_metadata=self.usage)
+        finally:
+            self.closed = True
+
+
+def reply(type=SignalType.none, confidence=Confidence.high, **overrides) -> str:
+    signal = Signal(
+        type=type,
+        confidence=confidence,
+        impact=ImpactLevel.low,
+        title="Company published its routine quarterly sustainability report",
+        action="No follow-up needed; mention at the next scheduled check-in",
+    )
+    return signal.model_copy(update=overrides).model_dump_json()
+
+
+def test_scanner_reads_fields_split_across_chunks():
+    text = '{"type": "none", "title": "Say \\"hi\\", ok", "amount": 12, "person": null}'
+    scanner = JsonFieldScanner()
+
+    scanner.feed(text[:14])
+    assert scanner.fields == {}
+
+    for char in text[14:]:
+        scanner.feed(char)
+
+    assert scanner.fields == {
+        "type": "none",
+        "title": 'Say "hi", ok',
+        "amount": 12,
+        "person": None,
+    }
+    assert scanner.complete
+
+
+def test_none_signal_is_cancelled_early(make_detector):
+    model = FakeStreamingChatModel(reply())
+    detector, _ = make_detector(chat_model=model, streaming=True)
+    run = ScanRun()
+
+    started = time.perf_counter()
+    assert detector.extract("Acme", "text", run) is None
+    elapsed = time.perf_counter() - started
+
+    full_time = len(model.pieces) * CHUNK_DELAY
+    tokens_saved = len(model.pieces) - model.sent
+    assert model.closed
+    assert tokens_saved / len(model.pieces) > 0.8
+    assert elapsed < full_time / 2
+    # Cancelled calls are still charged for what was generated
+    assert run.report()["total"]["output_tokens"] == model.sent
+
+
+def test_low_confidence_is_cancelled_early(make_detector):
+    model = FakeStreamingChatModel(
+        reply(type=SignalType.funding, confidence=Confidence.low)
+    )
+
+    detector, _ = make_detector(chat_model=model, streaming=True)
+
+    assert detector.extract("Acme", "text") is None
+    assert model.sent < len(model.pieces) / 4
+
+
+def test_kept_signal_is_fully_validated(make_detector, funding_signal):
+    model = FakeStreamingChatModel(funding_signal.model_dump_json())
+    detector, _ = make_detector(chat_model=model, streaming=True)
+    run = ScanRun()
+
+    assert detector.extract("Acme", "text", run) == funding_signal
+    assert model.bound["response_format"] is Signal
+    assert model.sent == len(model.pieces)
+    assert run.report()["total"]["input_tokens"] == 300
+
+
+def test_invalid_reply_is_a_parsing_error():
+    model = FakeStreamingChatModel(
+        reply(type=SignalType.funding).replace('"low"', '"urgent"')
+    )
+    llm = StreamingStructuredLLM(model, Signal, lambda fields: False)
+
+    result = llm.invoke("prompt")
+    assert result["parsed"] is None
+    assert result["parsing_error"] is not None
+
+
+def test_stopped_reply_replays_without_a_call(tmp_path, make_detector):
+    recorder = ReplayArchive(tmp_path, ReplayMode.record)
+    model = FakeStreamingChatModel(reply())
+    detector, _ = make_detector(chat_model=model, streaming=True, archive=recorder)
+    assert detector.extract("Acme", "text") is None
+    recorder.close()
+
+    replayed, _ = make_detector(streaming=True, archive=ReplayArchive(tmp_path))
+    run = ScanRun()
+    assert replayed.extract("Acme", "text", run) is None
+    assert run.report()["total"]["output_tokens"] == model.sent
@@ -0,0 +1,115 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.usage import Budget, BudgetExceeded, ScanRun
+from utils import ModelSpec
+
+SPEC = ModelSpec(
+    deployment_name="test-model",
+    model_name="test-model",
+    max_reply_tokens=100,
+    input_cost_per_million=1.0,
+    output_cost_per_million=4.0,
+)
+USAGE = {"input_tokens": 400, "output_tokens": 100, "total_tokens": 500}
+
+
+def test_model_spec_cost():
+    assert SPEC.cost(1_000_000, 500_000) == pytest.approx(3.0)
+
+
+def test_run_aggregates_per_company_and_model(make_detector, funding_signal):
+    detector, _ = make_detector(funding_signal, USAGE, spec=SPEC)
+    run = ScanRun()
+
+    detector.extract("Acme", "text", run)
+    detector.extract("Acme", "text", run)
+    detector.extract("Globex", "text", run)
+
+    report = run.report()
+    assert report["total"]["calls"] == 3
+    assert report["total"]["input_tokens"] == 1200
+    assert report["by_company"]["Acme"]["output_tokens"] == 200
+    assert report["by_company"]["Globex"]["signals"] == 1
+    assert report["by_model"]["test-model"]["calls"] == 3
+    assert report["cost_per_signal"] == pytest.approx(SPEC.cost(400, 100))
+
+
+def test_budget_stops_run_before_limit(make_detector, funding_signal):
+    detector, llm = make_detector(funding_signal, USAGE, spec=SPEC)
+    run = ScanRun(budget=Budget(max_tokens=1200, throttle_at=2))
+
+    detector.extract("Acme", "text", run)
+    detector.extract("Acme", "text", run)
+    with pytest.raises(BudgetExceeded):
+        detector.extract("Acme", "text", run)
+
+    assert llm.calls == 2
+    assert run.total.total_tokens == 1000
+
+
+def test_budget_throttles_near_limit(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("services.usage.time.sleep", sleeps.append)
+    run = ScanRun(budget=Budget(max_cost=0.01, throttle_at=0.5, throttle_seconds=2))
+
+    run.reserve(SPEC)
+    run.record("Acme", SPEC, 4000, 100)
+    run.reserve(SPEC)
+
+    assert sleeps == [2]
+
+
+def test_concurrent_calls_cannot_overshoot_budget(make_detector, funding_signal):
+    detector, llm = make_detector(funding_signal, USAGE, spec=SPEC)
+    run = ScanRun(budget=Budget(max_tokens=1000, throttle_at=2))
+    run.record("Acme", SPEC, 400, 100)
+
+    slow_invoke = llm.invoke
+    llm.invoke = lambda prompt: (time.sleep(0.05), slow_invoke(prompt))[1]
+
+    def extract():
+        try:
+            return detector.extract("Acme", "text", run)
+        except BudgetExceeded:
+            return "stopped"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: extract(), range(4)))
+
+    assert llm.calls == 1
+    assert results.count("stopped") == 3
+    assert run.total.total_tokens == 1000
+
+
+def test_failed_call_releases_its_reservation(make_detector, funding_signal):
+    detector, llm = make_detector(funding_signal, USAGE, spec=SPEC)
+    run = ScanRun(budget=Budget(max_tokens=1000, throttle_at=2))
+    run.record("Acme", SPEC, 400, 100)
+
+    def fail(prompt):
+        raise RuntimeError("timeout")
+
+    llm.invoke = fail
+    assert detector.extract("Acme", "text", run) is None
+    # The reservation was handed back, so the next call still fits
+    run.reserve(SPEC)
+
+
+def test_first_reservation_counts_prompt_tokens():
+    run = ScanRun(budget=Budget(max_tokens=150))
+    run.reserve(SPEC, prompt_tokens=40)
+    with pytest.raises(BudgetExceeded):
+        ScanRun(budget=Budget(max_tokens=150)).reserve(SPEC, prompt_tokens=60)
+
+
+def test_missing_usage_is_charged_an_estimate(make_detector, funding_signal):
+    detector, _ = make_detector(funding_signal, None, spec=SPEC)
+    run = ScanRun()
+
+    detector.extract("Acme", "text", run)
+
+    assert run.total.calls == 1
+    assert run.total.input_tokens > 0
@@ -1,21 +1,47 @@
+import math
 import os
 from dataclasses import dataclass
 
 from langchain_openai import AzureChatOpenAI
 from loguru import logger
 
+# Rough English average for OpenAI tokenizers; avoids tiktoken, which
+# downloads its encoding on first use and so can't run offline
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count for when the API reports no usage"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
 
 @dataclass
 class ModelSpec:
     deployment_name: str
     model_name: str
     max_reply_tokens: int
+    # USD per million tokens, used for run cost accounting
+    input_cost_per_million: float = 0.0
+    output_cost_per_million: float = 0.0
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (
+            input_tokens * self.input_cost_per_million
+            + output_tokens * self.output_cost_per_million
+        ) / 1_000_000
+
+
+DEFAULT_MODEL_SPEC = ModelSpec(
+    deployment_name="gpt-4o-mini",
+    model_name="gpt-4o-mini",
+    max_reply_tokens=2048,
+    input_cost_per_million=0.15,
+    output_cost_per_million=0.60,
+)
 
 
 def azure_chat_model(
-    spec: ModelSpec = ModelSpec(
-        deployment_name="gpt-4o-mini", model_name="gpt-4o-mini", max_reply_tokens=2048
-    ),
+    spec: ModelSpec = DEFAULT_MODEL_SPEC,
 ) -> AzureChatOpenAI:
     base_ = os.environ["AZURE_OPENAI_API_BASE"]
     logger.info(f"base url: {base_}, model name: {spec.model_name}")
@@ -0,0 +1,120 @@
+-- 20251019_signal_rollups.sql
+
+-- ===============================================
+-- DAILY SIGNAL ROLLUPS
+-- ===============================================
+-- Signal counts per company, type, impact and day. Maintained by
+-- statement-level triggers on public.signals, so a batch insert updates
+-- each affected rollup row once and dashboards never scan the base table.
+-- Rows without a detected_at have no stable day and are left out on every
+-- path (insert, update, delete and backfill) so counts stay consistent.
+CREATE TABLE IF NOT EXISTS public.signal_rollups_daily (
+    company_name TEXT NOT NULL,
+    signal_type TEXT NOT NULL,
+    impact TEXT NOT NULL,
+    bucket DATE NOT NULL,
+    signal_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_name, signal_type, impact, bucket)
+);
+
+-- Dashboard queries filter by time range first, then by company/type
+CREATE INDEX IF NOT EXISTS idx_rollups_bucket ON public.signal_rollups_daily(bucket DESC);
+CREATE INDEX IF NOT EXISTS idx_rollups_type_bucket ON public.signal_rollups_daily(signal_type, bucket DESC);
+
+-- Drill-down from a rollup row into the signals behind it
+CREATE INDEX IF NOT EXISTS idx_company_detected ON public.signals(company_name, detected_at DESC);
+
+-- ===============================================
+-- ROLLUP MAINTENANCE
+-- ===============================================
+CREATE OR REPLACE FUNCTION public.maintain_signal_rollups()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE public.signal_rollups_daily AS r
+        SET signal_count = r.signal_count - removed.n
+        FROM (
+            SELECT company_name, signal_type, impact,
+                   detected_at::date AS bucket,
+                   COUNT(*) AS n
+            FROM old_rows
+            WHERE detected_at IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+        ) AS removed
+        WHERE r.company_name = removed.company_name
+          AND r.signal_type = removed.signal_type
+          AND r.impact = removed.impact
+          AND r.bucket = removed.bucket;
+
+        -- Only the touched keys can have dropped to zero; probe them by
+        -- primary key rather than scanning the whole rollup table
+        DELETE FROM public.signal_rollups_daily AS r
+        USING (
+            SELECT DISTINCT company_name, signal_type, impact,
+                   detected_at::date AS bucket
+            FROM old_rows
+            WHERE detected_at IS NOT NULL
+        ) AS removed
+        WHERE r.company_name = removed.company_name
+          AND r.signal_type = removed.signal_type
+          AND r.impact = removed.impact
+          AND r.bucket = removed.bucket
+          AND r.signal_count <= 0;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.signal_rollups_daily AS r
+            (company_name, signal_type, impact, bucket, signal_count)
+        SELECT company_name, signal_type, impact,
+               detected_at::date,
+               COUNT(*)
+        FROM new_rows
+        WHERE detected_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (company_name, signal_type, impact, bucket)
+        DO UPDATE SET signal_count = r.signal_count + EXCLUDED.signal_count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS signals_rollup_insert ON public.signals;
+CREATE TRIGGER signals_rollup_insert
+    AFTER INSERT ON public.signals
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_signal_rollups();
+
+DROP TRIGGER IF EXISTS signals_rollup_update ON public.signals;
+CREATE TRIGGER signals_rollup_update
+    AFTER UPDATE ON public.signals
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_signal_rollups();
+
+DROP TRIGGER IF EXISTS signals_rollup_delete ON public.signals;
+CREATE TRIGGER signals_rollup_delete
+    AFTER DELETE ON public.signals
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_signal_rollups();
+
+-- ===============================================
+-- BACKFILL
+-- ===============================================
+TRUNCATE public.signal_rollups_daily;
+
+INSERT INTO public.signal_rollups_daily
+    (company_name, signal_type, impact, bucket, signal_count)
+SELECT company_name, signal_type, impact,
+       detected_at::date,
+       COUNT(*)
+FROM public.signals
+WHERE detected_at IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+
+-- ===============================================
+-- SECURITY SETTINGS
+-- ===============================================
+ALTER TABLE public.signal_rollups_daily DISABLE ROW LEVEL SECURITY;
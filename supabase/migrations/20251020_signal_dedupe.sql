@@ -0,0 +1,20 @@
+-- 20251020_signal_dedupe.sql
+
+-- ===============================================
+-- ONE SIGNAL PER ARTICLE
+-- ===============================================
+-- Scans cover a rolling window, so re-scanning a company sees the same
+-- articles again. Inserts go through ON CONFLICT DO NOTHING on this key,
+-- which keeps the first detection and leaves the rollups untouched.
+
+-- Drop duplicates already stored, keeping the earliest row. The rollup
+-- delete trigger takes them back out of the dashboard counts.
+DELETE FROM public.signals AS s
+USING public.signals AS kept
+WHERE s.company_name = kept.company_name
+  AND s.source_url = kept.source_url
+  AND s.signal_type = kept.signal_type
+  AND s.id > kept.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_signals_article
+    ON public.signals(company_name, source_url, signal_type);